@@ -43,6 +43,7 @@ _jit_imports = dict(
     eval=["hy.compiler", "hy_eval_user"],
     repr=["hy.core.hy_repr", "hy_repr"],
     repr_register=["hy.core.hy_repr", "hy_repr_register"],
+    repr_write=["hy.core.hy_repr", "hy_repr_write"],
     gensym="hy.core.util",
     macroexpand="hy.core.util",
     macroexpand_1="hy.core.util",
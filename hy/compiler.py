@@ -1,6 +1,5 @@
 import ast
 import builtins
-import copy
 import importlib
 import inspect
 import traceback
@@ -13,7 +12,7 @@ from funcparserlib.parser import NoParseError, many
 import hy
 from hy.compat import PY3_14
 from hy.errors import HyCompileError, HyLanguageError, HySyntaxError
-from hy.macros import macroexpand
+from hy.macros import MacroNamespace, macroexpand
 from hy.model_patterns import FORM, KEYWORD, unpack
 from hy.models import (
     Bytes,
@@ -36,7 +35,7 @@ from hy.models import (
     is_unpack,
 )
 from hy.reader import mangle, HyReader
-from hy.scoping import ResolveOuterVars, ScopeGlobal
+from hy.scoping import ScopeGlobal, resolve_outer_vars
 
 
 def calling_module(n=1):
@@ -82,8 +81,8 @@ def builds_model(*model_types):
 # Provide asty.Foo(x, ...) as shorthand for
 # ast.Foo(..., lineno=x.start_line, col_offset=x.start_column) or
 # ast.Foo(..., lineno=x.lineno, col_offset=x.col_offset)
-# Also provides asty.parse(x, ...) which recursively
-# copies x's position data onto the parse result.
+# Also provides asty.parse(x, ...) which copies x's position data onto
+# every node of the parse result.
 class Asty:
     POS_ATTRS = {
         "lineno": "start_line",
@@ -92,35 +91,51 @@ class Asty:
         "end_col_offset": "end_column",
     }
 
+    @staticmethod
+    def _pos(node):
+        "Return the position of `node` as a tuple in the order of `POS_ATTRS`."
+        if isinstance(node, Object):
+            try:
+                # Read the slots directly, which is much faster than
+                # the properties when the reader has set them all.
+                return (node._start_line, node._start_column,
+                    node._end_line, node._end_column)
+            except AttributeError:
+                return (node.start_line, node.start_column,
+                    node.end_line, node.end_column)
+        return tuple(getattr(node, attr, None) for attr in Asty.POS_ATTRS)
+
     @staticmethod
     def _get_pos(node):
-        return {
-            attr: getattr(node, hy_attr, getattr(node, attr, None))
-            for attr, hy_attr in Asty.POS_ATTRS.items()
-        }
+        return dict(zip(Asty.POS_ATTRS, Asty._pos(node)))
 
     @staticmethod
     def _replace_pos(node, pos):
-        for attr, value in pos.items():
-            if hasattr(node, attr):
-                setattr(node, attr, value)
-        for child in ast.iter_child_nodes(node):
-            Asty._replace_pos(child, pos)
+        lineno, col_offset, end_lineno, end_col_offset = pos
+        for child in ast.walk(node):
+            if child._attributes:
+                child.lineno = lineno
+                child.col_offset = col_offset
+                child.end_lineno = end_lineno
+                child.end_col_offset = end_col_offset
 
     def parse(self, x, *args, **kwargs):
         res = ast.parse(*args, **kwargs)
-        Asty._replace_pos(res, Asty._get_pos(x))
+        Asty._replace_pos(res, Asty._pos(x))
         return res
 
     def __getattr__(self, name):
-        setattr(
-            Asty,
-            name,
-            staticmethod(
-                lambda x, **kwargs: getattr(ast, name)(**Asty._get_pos(x), **kwargs)
-            ),
-        )
-        return getattr(Asty, name)
+        node_type = getattr(ast, name)
+        pos = Asty._pos
+
+        def make(x, **kwargs):
+            node = node_type(**kwargs)
+            (node.lineno, node.col_offset,
+                node.end_lineno, node.end_col_offset) = pos(x)
+            return node
+
+        setattr(Asty, name, staticmethod(make))
+        return make
 
 
 asty = Asty()
@@ -255,18 +270,39 @@ class Result:
         self.temp_variables = []
 
     def __add__(self, other):
+        other = self._addend(other)
+
+        # Fairly obvious addition
+        result = Result()
+        result.stmts = self.stmts + other.stmts
+        result.expr = other.expr
+        result.temp_variables = other.temp_variables
+
+        return result
+
+    def __iadd__(self, other):
+        """Add `other` in place. This is the same as `self + other`, but
+        appends to `self.stmts` instead of copying it, so a Result built
+        up in a loop, as with `ret += self.compile(x)`, takes linear time
+        instead of quadratic."""
+        other = self._addend(other)
+
+        self.stmts.extend(other.stmts)
+        self.expr = other.expr
+        self.temp_variables = other.temp_variables
+
+        return self
+
+    def _addend(self, other):
         # If we add an ast statement, convert it first
-        if isinstance(other, ast.stmt):
-            return self + Result(stmts=[other])
+        if isinstance(other, (ast.stmt, ast.excepthandler)):
+            other = Result(stmts=[other])
 
         # If we add an ast expression, clobber the expression context
-        if isinstance(other, ast.expr):
-            return self + Result(expr=other)
-
-        if isinstance(other, ast.excepthandler):
-            return self + Result(stmts=[other])
+        elif isinstance(other, ast.expr):
+            other = Result(expr=other)
 
-        if not isinstance(other, Result):
+        elif not isinstance(other, Result):
             raise TypeError(f"Can't add {self!r} with non-compiler result {other!r}")
 
         # Check for expression context clobbering
@@ -278,13 +314,7 @@ class Result:
                 )
             )
 
-        # Fairly obvious addition
-        result = Result()
-        result.stmts = self.stmts + other.stmts
-        result.expr = other.expr
-        result.temp_variables = other.temp_variables
-
-        return result
+        return other
 
     def __str__(self):
         return "Result(stmts=[%s], expr=%s)" % (
@@ -324,8 +354,7 @@ class HyASTCompiler:
                 over macros in `module`.
         """
         self.anon_var_count = 0
-        self.temp_if = None
-        self.extra_macros = extra_macros or {}
+        self.extra_macros = extra_macros or MacroNamespace()
 
         # Make a list of dictionaries with local compiler settings,
         # such as the definitions of local macros. The last element is
@@ -351,14 +380,21 @@ class HyASTCompiler:
 
         # Hy expects this to be present, so we prep the module for Hy
         # compilation.
-        self.module.__dict__.setdefault("_hy_macros", {})
+        self.module.__dict__.setdefault("_hy_macros", MacroNamespace())
         self.module.__dict__.setdefault("_hy_reader_macros", {})
 
         self.scope = ScopeGlobal(self)
 
+        self.macro_cache = None
+        # Set by `hy.macros.lookup_macro`.
+
+        self.outer_vars = []
+        # `OuterVar` nodes compiled so far, which `hy_compile` resolves
+        # once their scopes are complete.
+
     def new_local_state(self):
         'Add a new local state to the top of the stack.'
-        self.local_state_stack.append(dict(macros = {}))
+        self.local_state_stack.append(dict(macros = MacroNamespace()))
 
     def is_in_local_state(self):
         return len(self.local_state_stack) > 1
@@ -386,8 +422,10 @@ class HyASTCompiler:
         return f"_hy_{base}{name}_{self.anon_var_count}"
 
     def compile_atom(self, atom):
-        # Compilation methods may mutate the atom, so copy it first.
-        atom = copy.copy(atom)
+        # Compilation methods must not mutate the atom. Models can be
+        # shared (between a macro's arguments and its expansion, for
+        # instance), so a method that needs a changed model should build
+        # a new one, as with `Object.replace`.
         return Result() + _model_compilers[type(atom)](self, atom)
 
     def compile(self, tree):
@@ -544,7 +582,8 @@ class HyASTCompiler:
         try:
             yield
         finally:
-            self.local_state_stack.pop()
+            if self.local_state_stack.pop()['macros']:
+                MacroNamespace.changed()
 
     @builds_model(Expression)
     def compile_expression(self, expr):
@@ -877,14 +916,20 @@ def hy_compile(
         source = source,
         extra_macros = extra_macros)
 
-    with HyReader.using_reader(reader, create=False), compiler.scope:
-        result = compiler.compile(tree)
+    n_outer_vars = len(compiler.outer_vars)
+    try:
+        with HyReader.using_reader(reader, create=False), compiler.scope:
+            result = compiler.compile(tree)
+    finally:
+        outer_vars = compiler.outer_vars[n_outer_vars:]
+        del compiler.outer_vars[n_outer_vars:]
     expr = result.force_expr
 
     if not get_expr:
         result += result.expr_as_stmt()
 
-    result.stmts = list(map(ResolveOuterVars().visit, result.stmts))
+    if outer_vars:
+        result.stmts = resolve_outer_vars(outer_vars, result.stmts)
 
     body = []
 
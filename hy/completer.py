@@ -5,6 +5,7 @@ import re
 import sys
 
 from hy import mangle, unmangle
+from hy.macros import MacroNamespace
 
 # Lazily import `readline` to work around
 # https://github.com/python/cpython/issues/46927#issuecomment-1093418916
@@ -45,7 +46,7 @@ class Completer:
         self.namespace = namespace
         self.path = [builtins.__dict__, namespace]
 
-        namespace.setdefault("_hy_macros", {})
+        namespace.setdefault("_hy_macros", MacroNamespace())
         namespace.setdefault("_hy_reader_macros", {})
 
         self.path.append(namespace["_hy_macros"])
@@ -19,7 +19,13 @@ from hy import last_version
 from hy.compat import PY3_11, PY3_12, PY3_15
 from hy.compiler import Result, asty, mkexpr
 from hy.errors import HyEvalError, HyInternalError, HyTypeError
-from hy.macros import pattern_macro, require, require_reader, local_macro_name
+from hy.macros import (
+    local_macro_name,
+    lookup_macro,
+    pattern_macro,
+    require,
+    require_reader,
+)
 from hy.model_patterns import (
     FORM,
     KEYWORD,
@@ -222,65 +228,83 @@ def render_quoted_form(compiler, form, level):
     just nesting them.
     """
 
-    op = None
-    if isinstance(form, Expression) and form and isinstance(form[0], Symbol):
-        op = mangle(form[0]).replace('_', '-')
-        if op in ("unquote", "unquote-splice", "quasiquote"):
-            if level == 0 and op != "quasiquote":
-                if len(form) != 2:
-                    raise HyTypeError(
-                        "`%s' needs 1 argument, got %s" % op,
-                        len(form) - 1,
-                        compiler.filename,
-                        form,
-                        compiler.source,
+    # Walk the tree with an explicit stack, rendering each sequence
+    # after its elements, so that deeply nested forms don't need deep
+    # recursion. `done` holds the rendered forms that are waiting for
+    # their parent.
+    done = []
+    stack = [(form, level, False)]
+    while stack:
+        form, level, visited = stack.pop()
+
+        if not visited:
+            op = None
+            if isinstance(form, Expression) and form and isinstance(form[0], Symbol):
+                op = mangle(form[0]).replace('_', '-')
+                if op in ("unquote", "unquote-splice", "quasiquote"):
+                    if level == 0 and op != "quasiquote":
+                        if len(form) != 2:
+                            raise HyTypeError(
+                                "`%s' needs 1 argument, got %s" % op,
+                                len(form) - 1,
+                                compiler.filename,
+                                form,
+                                compiler.source,
+                            )
+                        done.append((form[1], op == "unquote-splice"))
+                        continue
+                    level += 1 if op == "quasiquote" else -1
+            if isinstance(form, Sequence):
+                stack.append((form, level, True))
+                stack.extend((x, level, False) for x in reversed(form))
+                continue
+
+        name = form.__class__.__name__
+        body = [form]
+
+        if isinstance(form, Sequence):
+            contents = []
+            for f_contents, splice in done[len(done) - len(form):]:
+                if splice:
+                    if is_unpack("iterable", f_contents):
+                        compiler._syntax_error(f_contents, "`unpack-iterable` is not allowed here")
+                    f_contents = Expression(
+                        [
+                            Symbol("unpack-iterable"),
+                            Expression([Symbol("or"), f_contents, List()]),
+                        ]
                     )
-                return form[1], op == "unquote-splice"
-            level += 1 if op == "quasiquote" else -1
-
-    name = form.__class__.__name__
-    body = [form]
-
-    if isinstance(form, Sequence):
-        contents = []
-        for x in form:
-            f_contents, splice = render_quoted_form(compiler, x, level)
-            if splice:
-                if is_unpack("iterable", f_contents):
-                    compiler._syntax_error(f_contents, "`unpack-iterable` is not allowed here")
-                f_contents = Expression(
-                    [
-                        Symbol("unpack-iterable"),
-                        Expression([Symbol("or"), f_contents, List()]),
-                    ]
-                )
-            contents.append(f_contents)
-        body = [List(contents)]
-
-        if isinstance(form, FString):
+                contents.append(f_contents)
+            del done[len(done) - len(form):]
+            body = [List(contents)]
+
+            if isinstance(form, FString):
+                if form.brackets is not None:
+                    body.extend([Keyword("brackets"), String(form.brackets)])
+                if form.is_tstring:
+                    body.extend([Keyword("is_tstring"), Symbol("True")])
+            elif isinstance(form, FComponent):
+                if form.conversion is not None:
+                    body.extend([Keyword("conversion"), String(form.conversion)])
+                if form.expression is not None:
+                    body.extend([Keyword("expression"), String(form.expression)])
+                if form.is_tstring:
+                    body.extend([Keyword("is_tstring"), Symbol("True")])
+
+        elif isinstance(form, Symbol):
+            body = [String(form), Keyword("from_parser"), Symbol("True")]
+
+        elif isinstance(form, Keyword):
+            body = [String(form.name), Keyword("from_parser"), Symbol("True")]
+
+        elif isinstance(form, String):
             if form.brackets is not None:
                 body.extend([Keyword("brackets"), String(form.brackets)])
-            if form.is_tstring:
-                body.extend([Keyword("is_tstring"), Symbol("True")])
-        elif isinstance(form, FComponent):
-            if form.conversion is not None:
-                body.extend([Keyword("conversion"), String(form.conversion)])
-            if form.expression is not None:
-                body.extend([Keyword("expression"), String(form.expression)])
-            if form.is_tstring:
-                body.extend([Keyword("is_tstring"), Symbol("True")])
 
-    elif isinstance(form, Symbol):
-        body = [String(form), Keyword("from_parser"), Symbol("True")]
+        done.append(
+            (Expression([dotted("hy.models." + name), *body]).replace(form), False))
 
-    elif isinstance(form, Keyword):
-        body = [String(form.name), Keyword("from_parser"), Symbol("True")]
-
-    elif isinstance(form, String):
-        if form.brackets is not None:
-            body.extend([Keyword("brackets"), String(form.brackets)])
-
-    return (Expression([dotted("hy.models." + name), *body]).replace(form), False)
+    return done[0]
 
 
 # ------------------------------------------------
@@ -601,9 +625,11 @@ def compile_global_or_nonlocal(compiler, expr, root, syms):
         return asty.Pass(expr)
 
     names = [mangle(s) for s in syms]
-    ret = (asty.Global(expr, names = names)
-        if root == "global" else
-        OuterVar(expr, compiler.scope, names))
+    if root == "global":
+        ret = asty.Global(expr, names = names)
+    else:
+        ret = OuterVar(expr, compiler.scope, names)
+        compiler.outer_vars.append(ret)
 
     try:
         compiler.scope.define_nonlocal(ret, root)
@@ -735,36 +761,46 @@ def compile_unpack_iterable(compiler, expr, root, arg):
 
 @pattern_macro("if", [FORM, FORM, FORM])
 def compile_if(compiler, expr, _, cond, body, orel_expr):
-    cond = compiler.compile(cond)
-    body = compiler.compile(body)
-
-    nested = root = False
-    orel = Result()
-    if (
-        isinstance(orel_expr, Expression)
-        and isinstance(orel_expr[0], Symbol)
-        and orel_expr[0] == Symbol("if*")
-    ):
-        # Nested ifs: don't waste temporaries
-        root = compiler.temp_if is None
-        nested = True
-        compiler.temp_if = compiler.temp_if or compiler.get_anon_var()
+    # Follow a chain of `if`s in else position, as produced by `cond`,
+    # with a loop instead of recursion, so that long chains don't
+    # exhaust the stack.
+    arms = [(expr, cond, body)]
+    while _is_if(compiler, orel_expr):
+        arms.append((orel_expr, orel_expr[1], orel_expr[2]))
+        orel_expr = orel_expr[3]
+    arms = [(e, compiler.compile(c), compiler.compile(b)) for e, c, b in arms]
     orel = compiler.compile(orel_expr)
 
+    if len(arms) > MAX_NESTED_IFS:
+        return _compile_flat_if(compiler, arms, orel)
+
+    for expr, cond, body in reversed(arms):
+        orel = _compile_if_arm(compiler, expr, cond, body, orel)
+    return orel
+
+
+# Longer chains than this are compiled to a flat sequence of
+# statements, since a deeply nested `ast.If` can exceed the recursion
+# limit of Python's own compiler.
+MAX_NESTED_IFS = 64
+
+
+def _is_if(compiler, form):
+    return (
+        isinstance(form, Expression)
+        and len(form) == 4
+        and form[0] == Symbol("if")
+        and lookup_macro("if", compiler.module, compiler) is _hy_macros["if"]
+    )
+
+
+def _compile_if_arm(compiler, expr, cond, body, orel):
     if not cond.stmts and isinstance(cond.force_expr, ast.Name):
         name = cond.force_expr.id
-        branch = None
         if name == "True":
-            branch = body
-        elif name in ("False", "None"):
-            branch = orel
-        if branch is not None:
-            if compiler.temp_if and branch.stmts:
-                name = asty.Name(expr, id=mangle(compiler.temp_if), ctx=ast.Store())
-
-                branch += asty.Assign(expr, targets=[name], value=body.force_expr)
-
-            return branch
+            return body
+        if name in ("False", "None"):
+            return orel
 
     # We want to hoist the statements from the condition
     ret = cond
@@ -772,15 +808,14 @@ def compile_if(compiler, expr, _, cond, body, orel_expr):
     if body.stmts or orel.stmts:
         # We have statements in our bodies
         # Get a temporary variable for the result storage
-        var = compiler.temp_if or compiler.get_anon_var()
+        var = compiler.get_anon_var()
         name = asty.Name(expr, id=mangle(var), ctx=ast.Store())
 
         # Store the result of the body
         body += asty.Assign(expr, targets=[name], value=body.force_expr)
 
         # and of the else clause
-        if not nested or not orel.stmts or (not root and var != compiler.temp_if):
-            orel += asty.Assign(expr, targets=[name], value=orel.force_expr)
+        orel += asty.Assign(expr, targets=[name], value=orel.force_expr)
 
         # Then build the if
         ret += asty.If(expr, test=ret.force_expr, body=body.stmts, orelse=orel.stmts)
@@ -795,12 +830,59 @@ def compile_if(compiler, expr, _, cond, body, orel_expr):
             expr, test=ret.force_expr, body=body.force_expr, orelse=orel.force_expr
         )
 
-    if root:
-        compiler.temp_if = None
-
     return ret
 
 
+def _compile_flat_if(compiler, arms, orel):
+    """Compile a chain of `if`s without nesting. Each arm after the
+    first runs only if no earlier test succeeded, which is tracked
+    with a flag:
+
+        flag = False
+        <statements of test 1>
+        if test1:
+            <body 1>
+            flag = True
+        if not flag:
+            <statements of test 2>
+            ...
+    """
+    expr = arms[0][0]
+    var = mangle(compiler.get_anon_var())
+    flag = mangle(compiler.get_anon_var())
+    name = asty.Name(expr, id=var, ctx=ast.Store())
+
+    def set_flag(expr):
+        return asty.Assign(
+            expr,
+            targets=[asty.Name(expr, id=flag, ctx=ast.Store())],
+            value=asty.Constant(expr, value=True))
+
+    def unless_flag(expr, stmts):
+        return asty.If(
+            expr,
+            test=asty.UnaryOp(
+                expr, op=ast.Not(), operand=asty.Name(expr, id=flag, ctx=ast.Load())
+            ),
+            body=stmts,
+            orelse=[])
+
+    ret = Result() + asty.Assign(
+        expr,
+        targets=[asty.Name(expr, id=flag, ctx=ast.Store())],
+        value=asty.Constant(expr, value=False))
+    for i, (expr, cond, body) in enumerate(arms):
+        body += asty.Assign(expr, targets=[name], value=body.force_expr)
+        body += set_flag(expr)
+        cond += asty.If(expr, test=cond.force_expr, body=body.stmts, orelse=[])
+        ret += unless_flag(expr, cond.stmts) if i else cond
+    orel += asty.Assign(expr, targets=[name], value=orel.force_expr)
+    ret += unless_flag(expr, orel.stmts)
+
+    expr_name = asty.Name(expr, id=var, ctx=ast.Load())
+    return ret + Result(expr=expr_name, temp_variables=[expr_name, name])
+
+
 # ------------------------------------------------
 # * The `for` family
 # ------------------------------------------------
@@ -1647,7 +1729,7 @@ def compile_function_node(compiler, expr, node, decorators, tp, name, args, retu
         enode = asty.Expr if scope.is_async and scope.has_yield else asty.Return
         body += enode(body.expr, value=body.expr)
 
-    ret += node(
+    scope.node = node(
         expr,
         name=name,
         args=args,
@@ -1656,6 +1738,7 @@ def compile_function_node(compiler, expr, node, decorators, tp, name, args, retu
         returns=compiler.compile(returns).force_expr if returns is not None else None,
         **digest_type_params(compiler, tp),
     )
+    ret += scope.node
 
     ast_name = asty.Name(expr, id=name, ctx=ast.Load())
     return ret + Result(temp_variables=[ast_name, ret.stmts[-1]])
@@ -1860,11 +1943,11 @@ def compile_class_expression(compiler, expr, root, decorators, tp, name, rest):
     name = mangle(compiler._nonconst(name))
     compiler.scope.define(name)
 
-    with compiler.local_state(), compiler.scope.create(ScopeFn):
+    with compiler.local_state(), compiler.scope.create(ScopeFn) as scope:
         e = compiler._compile_branch(body)
         bodyr += e + e.expr_as_stmt()
 
-    return ret + asty.ClassDef(
+    scope.node = asty.ClassDef(
         expr,
         decorator_list=decorators,
         name=name,
@@ -1873,6 +1956,7 @@ def compile_class_expression(compiler, expr, root, decorators, tp, name, rest):
         body=bodyr.stmts or [asty.Pass(expr)],
         **digest_type_params(compiler, tp)
     )
+    return ret + scope.node
 
 
 # ------------------------------------------------
@@ -52,6 +52,7 @@ class HyLanguageError(HyError):
                 will take precedence of this value. Defaults to `1`.
         """
         self.msg = message
+        self._position = (expression, lineno, colno)
         self.compute_lineinfo(expression, filename, source, lineno, colno)
 
         if isinstance(self, SyntaxError):
@@ -94,6 +95,18 @@ class HyLanguageError(HyError):
             self.offset = colno
             self.arrow_offset = None
 
+    def add_source(self, source):
+        """Compute the line information again with the source code ``source``,
+        if this error was raised without any, as for a source that was read
+        without being decoded all at once. Return this error."""
+        if not self.text:
+            expression, lineno, colno = self._position
+            self.compute_lineinfo(expression, self.filename, source, lineno, colno)
+            if isinstance(self, SyntaxError):
+                self.args = (
+                    self.msg, (self.filename, self.lineno, self.offset, self.text))
+        return self
+
     def __str__(self):
         """Provide an exception message that includes SyntaxError-like source
         line information when available.
@@ -11,6 +11,7 @@ from functools import partial
 
 import hy
 from hy.compiler import hy_compile
+from hy.errors import HyLanguageError
 from hy.reader import read_many, HyReader
 
 
@@ -122,14 +123,35 @@ def _could_be_hy_src(filename):
     )
 
 
+# Source files at least this big (in bytes) are decoded a chunk at a
+# time as they're read, instead of all at once into a string that would
+# have to be kept until compilation finishes. They're only decoded whole
+# if there's an error, so that it can quote the source.
+_STREAMED_SOURCE_SIZE = 1 << 24
+
+
+def _compile_hy_source(data, path, module):
+    streamed = len(data) >= _STREAMED_SOURCE_SIZE
+    tree = read_many(
+        data if streamed else data.decode("utf-8"),
+        filename=path,
+        skip_shebang=True,
+        reader=HyReader(),
+    )
+    try:
+        return hy_compile(tree, module)
+    except HyLanguageError as e:
+        if streamed:
+            e.add_source(str(data, "utf-8"))
+        raise
+
+
 def _hy_source_to_code(self, data, path, fullname=None, _optimize=-1):
     if _could_be_hy_src(path):
         if os.environ.get("HY_MESSAGE_WHEN_COMPILING"):
             print("Compiling", path, file=sys.stderr)
-        source = data.decode("utf-8")
-        hy_tree = read_many(source, filename=path, skip_shebang=True, reader=HyReader())
         with loader_module_obj(self) as module:
-            data = hy_compile(hy_tree, module)
+            data = _compile_hy_source(data, path, module)
 
     return _py_source_to_code(
         self, data, path,
@@ -153,10 +175,7 @@ if (".hy", False, False) not in zipimport._zip_searchorder:
         mname = f"<zip:{pathname}>"
         sys.modules[mname] = types.ModuleType(mname)
         return compile(
-            hy_compile(
-                read_many(source.decode("UTF-8"), filename=pathname, skip_shebang=True, reader=HyReader()),
-                sys.modules[mname],
-            ),
+            _compile_hy_source(source, pathname, sys.modules[mname]),
             pathname,
             "exec",
             dont_inherit=True,
@@ -25,6 +25,38 @@ from hy.reader.mangling import slashes2dots
 EXTRA_MACROS = ["hy.core.result_macros", "hy.core.macros"]
 
 
+class MacroNamespace(dict):
+    """A dictionary of macros, such as a module's `_hy_macros`. Changing any
+    `MacroNamespace` invalidates the compilers' caches of macro lookups (see
+    `lookup_macro`). Lookups that involve an ordinary dictionary instead
+    aren't cached."""
+
+    version = 0
+    # Incremented whenever any `MacroNamespace` changes.
+
+    @staticmethod
+    def changed():
+        MacroNamespace.version += 1
+
+
+def _changing(name):
+    method = getattr(dict, name)
+
+    def f(self, *args, **kwargs):
+        MacroNamespace.changed()
+        return method(self, *args, **kwargs)
+
+    f.__name__ = f.__qualname__ = name
+    return f
+
+
+for _name in (
+        "__setitem__", "__delitem__", "__ior__",
+        "clear", "pop", "popitem", "setdefault", "update"):
+    setattr(MacroNamespace, _name, _changing(_name))
+del _name
+
+
 def macro(name):
     """Decorator to define a macro called `name`."""
     return lambda fn: install_macro(name, fn, fn)
@@ -84,7 +116,7 @@ def pattern_macro(names, pattern, shadow=None):
 def install_macro(name, fn, module_of):
     name = mangle(name)
     fn = rename_function(fn, name)
-    module_of.__globals__.setdefault("_hy_macros", {})[name] = fn
+    module_of.__globals__.setdefault("_hy_macros", MacroNamespace())[name] = fn
     return fn
 
 
@@ -196,7 +228,7 @@ def require(source_module, target, assignments, prefix="", target_module_name=No
     - `assignments` can be "ALL", "EXPORTS", or a list of (macro
       name, alias) pairs."""
 
-    if type(target) is dict:
+    if isinstance(target, dict):
         target_module = None
     else:
         target_module, target_namespace = derive_target_module(
@@ -214,7 +246,7 @@ def require(source_module, target, assignments, prefix="", target_module_name=No
         source_module = import_module_from_string(source_module,
            target_module_name or target_module or '')
 
-    source_macros = source_module.__dict__.setdefault("_hy_macros", {})
+    source_macros = source_module.__dict__.setdefault("_hy_macros", MacroNamespace())
     source_exports = getattr(
         source_module,
         "_hy_export_macros",
@@ -241,7 +273,10 @@ def require(source_module, target, assignments, prefix="", target_module_name=No
                 )
         return out
 
-    target_macros = target_namespace.setdefault("_hy_macros", {}) if target_module else target
+    target_macros = (
+        target_namespace.setdefault("_hy_macros", MacroNamespace())
+        if target_module
+        else target)
 
     if prefix:
         prefix += "."
@@ -289,7 +324,7 @@ def load_macros(module):
     It is an error to call this on any module in `hy.core`.
     """
     builtin_macros = EXTRA_MACROS
-    module._hy_macros = {}
+    module._hy_macros = MacroNamespace()
     module._hy_reader_macros = {}
 
     for builtin_mod_name in builtin_macros:
@@ -343,6 +378,59 @@ class MacroExceptions:
             return False
 
 
+def lookup_macro(name, module, compiler=None):
+    """Return the macro that the mangled `name` refers to in `module` (and,
+    if given, the local scopes of `compiler`), or `None` if there isn't
+    one."""
+    if compiler is None:
+        return _lookup_macro(name, module)
+
+    # Each compiler caches its lookups until a macro namespace changes.
+    # Local macro namespaces come and go with local states, but they're
+    # empty when they're created, so only popping a nonempty one
+    # changes anything, and `HyASTCompiler.local_state` accounts for
+    # that.
+    module_macros = getattr(module, "_hy_macros", None)
+    builtin_macros = getattr(builtins, "_hy_macros", None)
+    cache = compiler.macro_cache
+    if not (cache
+            and cache[0] == MacroNamespace.version
+            and cache[1] is module_macros
+            and cache[2] is builtin_macros):
+        cache = compiler.macro_cache = (
+            MacroNamespace.version,
+            module_macros,
+            builtin_macros,
+            {} if all(
+                    type(d) is MacroNamespace
+                    for d in (compiler.extra_macros, module_macros, builtin_macros))
+                else None)
+    table = cache[3]
+    if table is None:
+        return _lookup_macro(name, module, compiler)
+    try:
+        return table[name]
+    except KeyError:
+        m = table[name] = _lookup_macro(name, module, compiler)
+        return m
+
+
+def _lookup_macro(name, module, compiler=None):
+    # Choose the first namespace with the macro.
+    return ((compiler and next(
+            (d[name]
+                for d in [
+                    compiler.extra_macros,
+                    *(s['macros'] for s in reversed(compiler.local_state_stack))]
+                if name in d),
+            None)) or
+        next(
+            (mod._hy_macros[name]
+                for mod in (module, builtins)
+                if name in getattr(mod, "_hy_macros", ())),
+            None))
+
+
 def macroexpand(tree, module, compiler=None, once=False, result_ok=True):
     '''If `tree` isn't an `Expression` that might be a macro call,
     return it unchanged. Otherwise, try to expand it. Do this
@@ -381,19 +469,7 @@ def macroexpand(tree, module, compiler=None, once=False, result_ok=True):
             except (AttributeError, KeyError):
                 raise HyRequireError(f'Could not require name {fn} from {req_from}')
         else:
-            # Choose the first namespace with the macro.
-            m = ((compiler and next(
-                    (d[fn]
-                        for d in [
-                            compiler.extra_macros,
-                            *(s['macros'] for s in reversed(compiler.local_state_stack))]
-                        if fn in d),
-                    None)) or
-                next(
-                    (mod._hy_macros[fn]
-                        for mod in (module, builtins)
-                        if fn in getattr(mod, "_hy_macros", ())),
-                    None))
+            m = lookup_macro(fn, module, compiler)
             if not m:
                 break
 
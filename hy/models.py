@@ -1,6 +1,10 @@
 import operator
+import struct
+import sys
+from array import array
+from hashlib import blake2b
 from contextlib import contextmanager
-from functools import reduce, total_ordering
+from functools import lru_cache, reduce, total_ordering
 from itertools import groupby
 from math import isinf, isnan
 
@@ -39,6 +43,74 @@ class Object:
 
     properties = ["_start_line", "_end_line", "_start_column", "_end_column"]
 
+    # Subclasses add their own slots where the built-in base type allows
+    # it; see `_slots`.
+    __slots__ = ()
+
+    def __getstate__(self):
+        # Spell out the slots, since pickling with protocols 0 and 1
+        # can't otherwise handle them.
+        slots = {
+            k: getattr(self, k)
+            for c in type(self).__mro__
+            for k in c.__dict__.get("__slots__", ())
+            if k not in ("__dict__", "__weakref__") and hasattr(self, k)
+        }
+        return getattr(self, "__dict__", None), slots
+
+    def fingerprint(self):
+        """Return a hash of the structure of this model, as a string of 32
+        hexadecimal digits. Two models have the same fingerprint if they have
+        the same types, values, and attributes such as
+        :attr:`String.brackets <hy.models.String>`, recursively, but positions
+        don't matter. So, the fingerprint is suitable as a key for caching the
+        results of macro-expansion, compilation, and the like. It's the same in
+        every process.
+
+        The fingerprint is computed once, then saved on the model and on each
+        of its submodels. So, attributes that are included shouldn't be changed
+        afterwards. The exceptions are format components, which
+        :meth:`replace` can change in place, and models that contain them.
+        Their fingerprints are computed anew each time."""
+
+        try:
+            return self._fingerprint
+        except AttributeError:
+            pass
+        # Visit submodels first, without recursion, so deeply nested
+        # trees are no problem. Fingerprints that mustn't be kept are
+        # saved only until the end of the call.
+        unsaved = {}
+        stack = [self]
+        while stack:
+            m = stack[-1]
+            pending = [
+                x
+                for x in (m if isinstance(m, Sequence) else ())
+                if isinstance(x, Object) and not hasattr(x, "_fingerprint")
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            if not hasattr(m, "_fingerprint"):
+                h = blake2b(digest_size=16)
+                h.update(f"{type(m).__module__}.{type(m).__qualname__}\0".encode())
+                h.update(m._fingerprint_data())
+                m._fingerprint = h.hexdigest()
+                if isinstance(m, FComponent) or (
+                    isinstance(m, Sequence) and any(id(x) in unsaved for x in m)
+                ):
+                    unsaved[id(m)] = m
+        result = self._fingerprint
+        for m in unsaved.values():
+            del m._fingerprint
+        return result
+
+    def _fingerprint_data(self):
+        # The bytes that identify this model, given its type.
+        raise TypeError(f"Can't fingerprint {type(self).__name__} objects")
+
     def replace(self, other, recursive=False):
         if isinstance(other, Object):
             for attr in self.properties:
@@ -102,6 +174,17 @@ class Object:
         return super().__hash__()
 
 
+# The attributes that the reader sets on every model. Models based on
+# `str`, `float`, `complex`, or `object` keep them in slots, which spares
+# each such model an instance dictionary. (Python doesn't allow nonempty
+# `__slots__` for subclasses of `int`, `bytes`, or `tuple`.) `__dict__`
+# is still available for any other attributes.
+_slots = (*Object.properties, "reader", "_fingerprint", "__dict__", "__weakref__")
+
+
+def _text(x):
+    return str(x).encode("utf-8", "surrogatepass")
+
 _wrappers = {}
 _seen = set()
 
@@ -119,6 +202,10 @@ def as_model(x):
     It's an error to call ``hy.as-model`` on an object that contains itself, or
     an object that isn't representable as a Hy literal, such as a function."""
 
+    if isinstance(x, Sequence) and _all_models(x):
+        # There's nothing to convert, so don't rebuild the tree.
+        return x
+
     if id(x) in _seen:
         raise HyWrapperError("Self-referential structure detected in {!r}".format(x))
 
@@ -130,10 +217,53 @@ def as_model(x):
     return new
 
 
+def _all_models(tree):
+    """Return whether every element of the sequence model ``tree`` is a model,
+    recursively. Each sequence remembers the answer, which can't change,
+    since sequences are immutable."""
+
+    result = getattr(tree, "_models_only", None)
+    if result is not None:
+        return result
+    # Find the sequences that haven't been checked yet, parents before
+    # children, and then check them in reverse.
+    todo = [tree]
+    stack = [tree]
+    while stack:
+        for x in stack.pop():
+            if isinstance(x, Sequence) and getattr(x, "_models_only", None) is None:
+                todo.append(x)
+                stack.append(x)
+    for seq in reversed(todo):
+        seq._models_only = all(
+            x._models_only if isinstance(x, Sequence) else isinstance(x, Object)
+            for x in seq
+        )
+    return tree._models_only
+
+
 def replace_hy_obj(obj, other):
     return as_model(obj).replace(other)
 
 
+def fill_missing_pos(tree, other):
+    """Copy the position attributes of ``other`` onto ``tree`` wherever they're
+    unset, then do the same for each submodel that has no position yet. Models
+    are updated in place and never rebuilt. A submodel that already has a
+    position is assumed to have positions throughout, and is skipped."""
+
+    Object.replace(tree, other)
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Sequence):
+            for x in node:
+                if isinstance(x, Object) and not hasattr(x, "_start_line"):
+                    Object.replace(x, other)
+                    stack.append(x)
+    return tree
+
+
 def repr_indent(obj):
     return repr(obj).replace("\n", "\n  ")
 
@@ -153,6 +283,7 @@ class String(Object, str):
     """
 
     __match_args__ = ("_as_str",)
+    __slots__ = (*_slots, "brackets")
 
     def __new__(cls, s=None, brackets=None):
         value = super().__new__(cls, s)
@@ -170,6 +301,10 @@ class String(Object, str):
     def __add__(self, other):
         return self.__class__(super().__add__(other))
 
+    def _fingerprint_data(self):
+        brackets = _text(repr(self.brackets))
+        return b"%d:%s%s" % (len(brackets), brackets, _text(self))
+
     @property
     def _as_str(self):
         return str(self)
@@ -185,6 +320,9 @@ class Bytes(Object, bytes):
 
     __match_args__ = ("_as_bytes",)
 
+    def _fingerprint_data(self):
+        return bytes(self)
+
     @property
     def _as_bytes(self):
         return bytes(self)
@@ -202,25 +340,59 @@ class Symbol(Object, str):
     """
 
     __match_args__ = ("_as_str",)
+    __slots__ = _slots
 
     def __new__(cls, s, from_parser=False):
         s = str(s)
         if not from_parser:
-            # Check that the symbol is syntactically legal.
-            # import here to prevent circular imports.
-            from hy.reader.hy_reader import as_identifier
-
-            sym = as_identifier(s)
-            if not isinstance(sym, Symbol):
-                raise ValueError(f"Syntactically illegal symbol: {s!r}")
-            return sym
+            _check_symbol(s)
         return super().__new__(cls, s)
 
+    def __eq__(self, other):
+        return self is other or Object.__eq__(self, other)
+
+    __hash__ = Object.__hash__
+
+    def __getnewargs__(self):
+        # Skip the syntax check when copying or unpickling.
+        return (str(self), True)
+
+    def _fingerprint_data(self):
+        return _text(self)
+
     @property
     def _as_str(self):
         return str(self)
 
 
+# The compiler and macros construct the same symbols and keywords over
+# and over, so remember which names are known to be legal. Failures
+# aren't cached, so each one raises its own error.
+
+
+@lru_cache(maxsize=4096)
+def _check_symbol(s):
+    # import here to prevent circular imports.
+    from hy.reader.hy_reader import as_identifier
+
+    if not isinstance(as_identifier(s), Symbol):
+        raise ValueError(f"Syntactically illegal symbol: {s!r}")
+
+
+@lru_cache(maxsize=4096)
+def _check_keyword(value):
+    # import here to prevent circular imports.
+    from hy.reader.hy_reader import HyReader
+    from hy.reader.reader import isnormalizedspace
+
+    if value and (
+        "." in value
+        or any(isnormalizedspace(c) for c in value)
+        or HyReader.NON_IDENT.intersection(value)
+    ):
+        raise ValueError(f'Syntactically illegal keyword: {":" + value!r}')
+
+
 _wrappers[bool] = lambda x: Symbol("True") if x else Symbol("False")
 _wrappers[type(None)] = lambda _: Symbol("None")
 
@@ -235,26 +407,22 @@ class Keyword(Object):
     """
 
     __match_args__ = ("name",)
+    __slots__ = (*_slots, "name")
 
     def __init__(self, value, from_parser=False):
         value = str(value)
         if not from_parser:
-            # Check that the keyword is syntactically legal.
-            # import here to prevent circular imports.
-            from hy.reader.hy_reader import HyReader
-            from hy.reader.reader import isnormalizedspace
-
-            if value and (
-                "." in value
-                or any(isnormalizedspace(c) for c in value)
-                or HyReader.NON_IDENT.intersection(value)
-            ):
-                raise ValueError(f'Syntactically illegal keyword: {":" + value!r}')
-        self.name = value
+            _check_keyword(value)
+        # Keywords with the same name share one string, which also
+        # makes comparing and hashing them cheaper.
+        self.name = sys.intern(value)
 
     def __repr__(self):
         return f"hy.models.{self.__class__.__name__}({self.name!r})"
 
+    def _fingerprint_data(self):
+        return _text(self.name)
+
     def __str__(self):
         return ":%s" % self.name
 
@@ -262,11 +430,15 @@ class Keyword(Object):
         return hash(self.name)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Keyword):
             return NotImplemented
         return self.name == other.name
 
     def __ne__(self, other):
+        if self is other:
+            return False
         if not isinstance(other, Keyword):
             return NotImplemented
         return self.name != other.name
@@ -336,6 +508,9 @@ class Integer(Object, int):
             ),
         )
 
+    def _fingerprint_data(self):
+        return b"%d" % self
+
     @property
     def _as_int(self):
         return int(self)
@@ -357,12 +532,16 @@ class Float(Object, float):
     Represents a literal floating-point real number (:class:`float`).
     """
     __match_args__ = ("_as_float",)
+    __slots__ = _slots
 
     def __new__(cls, num, *args, **kwargs):
         value = super().__new__(cls, strip_digit_separators(num))
         check_inf_nan_cap(num, value)
         return value
 
+    def _fingerprint_data(self):
+        return float.hex(self).encode()
+
     @property
     def _as_float(self):
         return float(self)
@@ -379,6 +558,7 @@ class Complex(Object, complex):
     real.
     """
     __match_args__ = ("real", "imag")
+    __slots__ = _slots
 
     def __new__(cls, real, imag=0, *args, **kwargs):
         if isinstance(real, str):
@@ -396,6 +576,9 @@ class Complex(Object, complex):
             real, imag = real.real, imag + real.imag
         return super().__new__(cls, real, imag)
 
+    def _fingerprint_data(self):
+        return f"{self.real.hex()},{self.imag.hex()}".encode()
+
 
 _wrappers[complex] = Complex
 
@@ -417,16 +600,40 @@ class Sequence(Object, tuple):
     _extra_kwargs = ()
 
     def replace(self, other, recursive=True):
-        return (
-            Object.replace(
-                Object.replace(
-                    type(self)(
-                        (replace_hy_obj(x, other) for x in self),
-                        **{k: getattr(self, k) for k in self._extra_kwargs}),
-                    self),
-                other)
-            if recursive
-            else Object.replace(self, other))
+        """Copy the position attributes of ``other`` onto this model wherever
+        they're unset, and if ``recursive``, onto each of its submodels, too.
+        A sequence that has no position of its own may be shared, as by a
+        macro that returns the same form each time, so it's rebuilt rather
+        than updated. A sequence that already has a position, and whose
+        elements need no rebuilding, is kept as it is."""
+
+        if not recursive:
+            return Object.replace(self, other)
+        # Visit the tree children-first, without recursion. `done` maps the
+        # `id` of each sequence visited to its replacement.
+        done = {}
+        stack = [self]
+        while stack:
+            seq = stack[-1]
+            todo = [x for x in seq if isinstance(x, Sequence) and id(x) not in done]
+            if todo:
+                stack.extend(todo)
+                continue
+            stack.pop()
+            if id(seq) in done:
+                continue
+            items = [
+                done[id(x)] if isinstance(x, Sequence) else replace_hy_obj(x, other)
+                for x in seq]
+            if hasattr(seq, "_start_line") and all(
+                    a is b for a, b in zip(items, seq)):
+                done[id(seq)] = seq.replace(other, recursive=False)
+            else:
+                done[id(seq)] = (
+                    type(seq)(items, **{k: getattr(seq, k) for k in seq._extra_kwargs})
+                    .replace(seq, recursive=False)
+                    .replace(other, recursive=False))
+        return done[id(self)]
 
     def __add__(self, other):
         return self.__class__(
@@ -436,6 +643,17 @@ class Sequence(Object, tuple):
     def __getslice__(self, start, end):
         return self.__class__(super().__getslice__(start, end))
 
+    def _fingerprint_data(self):
+        attrs = _text(repr(tuple(getattr(self, k) for k in self._extra_kwargs)))
+        return b"%d:%s%s" % (
+            len(attrs),
+            attrs,
+            b"".join(
+                (x if isinstance(x, Object) else as_model(x)).fingerprint().encode()
+                for x in self
+            ),
+        )
+
     def __getitem__(self, item):
         ret = super().__getitem__(item)
 
@@ -477,6 +695,9 @@ class FComponent(Sequence):
         return value
 
     def replace(self, other, recursive=True):
+        if recursive:
+            # `Sequence.replace` calls back here for each component.
+            return super().replace(other, recursive)
         super().replace(other, recursive)
         for attr in self._extra_kwargs:
             if hasattr(other, attr):
@@ -696,3 +917,286 @@ class Lazy(Object):
 
     def __next__(self):
         return self._gen.__next__()
+
+
+
+# A binary format for saving and loading trees of models, without
+# going through the reader. It starts with a header (see `_dump_header`)
+# giving the sizes of each of the following sections:
+#
+# - An array of integers describing the models. It begins with the
+#   lengths of the strings and then the lengths of the bytes objects,
+#   and then the models follow, in postorder. Each model is a tag (its
+#   type code, plus four bits saying which position attributes are
+#   present) followed by the fields for that type.
+# - An array of the positions. Each start line is saved relative to the
+#   previous one, and each end line relative to its start line, which
+#   keeps the numbers small.
+# - An array of the values of integer models.
+# - An array of doubles, for floating-point and complex numbers.
+# - All the strings (text of strings, symbols, keywords, and so on),
+#   each stored once, concatenated as UTF-8.
+# - All the bytes objects, concatenated.
+#
+# The first two arrays use the smallest width of integer that holds all
+# their elements.
+
+_DUMP_MAGIC = b"HYMODEL"
+_DUMP_VERSION = 1
+_dump_header = struct.Struct("<7sBcc8I")
+_dump_types = (
+    Symbol, Expression, String, Keyword, Integer, Float, Complex, Bytes,
+    List, Dict, Set, Tuple, FString, FComponent)
+_dump_codes = {t: i for i, t in enumerate(_dump_types)}
+# For integers too big for the array of integer values, which are
+# saved in hexadecimal with the strings.
+_BIG_INTEGER = len(_dump_types)
+_INT64 = 1 << 63
+
+
+def _int_array(values):
+    lo, hi = min(values, default=0), max(values, default=0)
+    for typecode in "bhiq":
+        bound = 1 << (8 * array(typecode).itemsize - 1)
+        if -bound <= lo and hi < bound:
+            break
+    return array(typecode, values)
+
+
+def dumps(model):
+    """Return a :class:`bytes` object encoding ``model``, with all its
+    submodels and their positions, which :func:`hy.models.loads` can turn back
+    into an equal model. Loading is much faster than reading the equivalent
+    code. Only the built-in model types can be saved. The format is versioned,
+    and it's the same on every platform, but data written by a newer version of
+    Hy can't necessarily be loaded by an older one."""
+
+    strings = {}
+    blobs = []
+    nodes = []
+    positions = []
+    values = []
+    floats = []
+    line = 0
+
+    def string(s):
+        if s not in strings:
+            strings[s] = len(strings)
+        return strings[s]
+
+    def optional(s):
+        return 0 if s is None else string(s) + 1
+
+    stack = [(as_model(model), False)]
+    while stack:
+        m, done = stack.pop()
+        code = _dump_codes.get(type(m))
+        if code is None:
+            raise TypeError(f"Can't dump {type(m).__name__} objects")
+        if isinstance(m, Sequence) and not done:
+            stack.append((m, True))
+            stack.extend((x, False) for x in reversed(m))
+            continue
+        fields = []
+        if code == 0:
+            fields.append(string(str(m)))
+        elif code == 2:
+            fields += [string(str(m)), optional(m.brackets)]
+        elif code == 3:
+            fields.append(string(m.name))
+        elif code == 4:
+            if -_INT64 <= m < _INT64:
+                fields.append(len(values))
+                values.append(int(m))
+            else:
+                code = _BIG_INTEGER
+                fields.append(string(format(m, "x")))
+        elif code == 5:
+            fields.append(len(floats))
+            floats.append(m)
+        elif code == 6:
+            fields.append(len(floats))
+            floats += [m.real, m.imag]
+        elif code == 7:
+            fields.append(len(blobs))
+            blobs.append(bytes(m))
+        else:
+            if code == 12:
+                fields += [optional(m.brackets), int(m.is_tstring)]
+            elif code == 13:
+                fields += [
+                    optional(m.conversion),
+                    optional(m.expression),
+                    int(m.is_tstring)]
+            fields.append(len(m))
+        mask = 0
+        for i, attr in enumerate(Object.properties):
+            if hasattr(m, attr):
+                mask |= 1 << i
+                value = int(getattr(m, attr))
+                if attr == "_start_line":
+                    value, line = value - line, value
+                elif attr == "_end_line":
+                    value -= line
+                positions.append(value)
+        nodes.append(code | mask << 4)
+        nodes += fields
+
+    arrays = (
+        _int_array([len(s) for s in strings] + [len(b) for b in blobs] + nodes),
+        _int_array(positions),
+        array("q", values),
+        array("d", floats))
+    if sys.byteorder == "big":
+        for a in arrays:
+            a.byteswap()
+    text = "".join(strings).encode("utf-8", "surrogatepass")
+    blob = b"".join(blobs)
+    return b"".join((
+        _dump_header.pack(
+            _DUMP_MAGIC, _DUMP_VERSION,
+            arrays[0].typecode.encode(), arrays[1].typecode.encode(),
+            len(strings), len(blobs), *map(len, arrays), len(text), len(blob)),
+        *(a.tobytes() for a in arrays),
+        text,
+        blob))
+
+
+def loads(data):
+    """Return the model encoded in ``data``, a bytes-like object returned by
+    :func:`hy.models.dumps`. Raise :class:`ValueError` if it isn't valid."""
+
+    invalid = ValueError("Invalid dump of Hy models")
+    view = memoryview(data).cast("B")
+    try:
+        (magic, version, node_typecode, position_typecode, n_strings, n_blobs,
+         *counts, n_text, n_blob) = _dump_header.unpack_from(view)
+    except struct.error:
+        raise invalid from None
+    if magic != _DUMP_MAGIC:
+        raise invalid
+    if version != _DUMP_VERSION:
+        raise ValueError(f"Unsupported version of Hy model dump: {version}")
+    try:
+        arrays = [
+            array(typecode)
+            for typecode in (
+                node_typecode.decode(), position_typecode.decode(), "q", "d")]
+    except ValueError:
+        raise invalid from None
+    start = _dump_header.size
+    sizes = [n * a.itemsize for n, a in zip(counts, arrays)] + [n_text, n_blob]
+    if len(view) != start + sum(sizes):
+        raise invalid
+    sections = []
+    for size in sizes:
+        sections.append(view[start : start + size])
+        start += size
+    for a, section in zip(arrays, sections):
+        a.frombytes(section)
+        if sys.byteorder == "big":
+            a.byteswap()
+    ints, positions, values, floats = (a.tolist() for a in arrays)
+
+    text = str(sections[4], "utf-8", "surrogatepass")
+    strings = []
+    start = 0
+    for n in ints[:n_strings]:
+        strings.append(text[start : start + n])
+        start += n
+    # Index 0 of `optional` means `None`.
+    optional = [None, *strings]
+    blob = bytes(sections[5])
+    start = 0
+    blobs = []
+    for n in ints[n_strings : n_strings + n_blobs]:
+        blobs.append(blob[start : start + n])
+        start += n
+
+    properties = Object.properties
+    it = iter(ints[n_strings + n_blobs :])
+    nxt = it.__next__
+    pnxt = iter(positions).__next__
+    line = 0
+    out = []
+
+    def children(n):
+        # Pop the last `n` models from `out`.
+        if not 0 <= n <= len(out):
+            raise invalid
+        c = out[len(out) - n :]
+        del out[len(out) - n :]
+        return c
+
+    try:
+        for tag in it:
+            code = tag & 15
+            if code == 0:
+                m = Symbol(strings[nxt()], True)
+            elif code == 1 or 8 <= code <= 11:
+                m = _dump_types[code](children(nxt()))
+            elif code == 2:
+                m = String(strings[nxt()], optional[nxt()])
+            elif code == 3:
+                m = Keyword(strings[nxt()], True)
+            elif code == 4:
+                m = int.__new__(Integer, values[nxt()])
+            elif code == 5:
+                m = float.__new__(Float, floats[nxt()])
+            elif code == 6:
+                i = nxt()
+                m = complex.__new__(Complex, floats[i], floats[i + 1])
+            elif code == 7:
+                m = bytes.__new__(Bytes, blobs[nxt()])
+            elif code == 12:
+                brackets, is_tstring, n = nxt(), nxt(), nxt()
+                m = FString(
+                    children(n),
+                    brackets=optional[brackets],
+                    is_tstring=bool(is_tstring))
+            elif code == 13:
+                conversion, expression, is_tstring, n = nxt(), nxt(), nxt(), nxt()
+                m = FComponent(
+                    children(n),
+                    conversion=optional[conversion],
+                    expression=optional[expression],
+                    is_tstring=bool(is_tstring))
+            elif code == _BIG_INTEGER:
+                m = int.__new__(Integer, int(strings[nxt()], 16))
+            else:
+                raise invalid
+            mask = tag >> 4
+            if mask == 15:
+                line += pnxt()
+                m._start_line = line
+                m._end_line = line + pnxt()
+                m._start_column = pnxt()
+                m._end_column = pnxt()
+            elif mask:
+                for i, attr in enumerate(properties):
+                    if mask & 1 << i:
+                        value = pnxt()
+                        if attr == "_start_line":
+                            line += value
+                            value = line
+                        elif attr == "_end_line":
+                            value += line
+                        setattr(m, attr, value)
+            out.append(m)
+    except (StopIteration, IndexError):
+        raise invalid from None
+    if len(out) != 1:
+        raise invalid
+    return out[0]
+
+
+def dump(model, file):
+    """Write :func:`hy.models.dumps` of ``model`` to the binary file object
+    ``file``."""
+    file.write(dumps(model))
+
+
+def load(file):
+    """Read a model from the binary file object ``file``, as written by
+    :func:`hy.models.dump`."""
+    return loads(file.read())
@@ -1,21 +1,76 @@
+import mmap
 import re
-from io import StringIO
 
 import hy.models
 
+from .cache import ParseCache
 from .hy_reader import HyReader
 from .mangling import mangle, unmangle
+from .parallel import read_parallel
+from .reader import _UTF8Stream
 
-__all__ = ["mangle", "unmangle", "read", "read_many"]
+__all__ = ["mangle", "unmangle", "read", "read_many", "ParseCache"]
 
+_buffer_types = (bytes, bytearray, memoryview, mmap.mmap)
 
-def read_many(stream, filename="<string>", reader=None, skip_shebang=False):
+
+def read_many(
+    stream,
+    filename="<string>",
+    reader=None,
+    skip_shebang=False,
+    *,
+    streaming=False,
+    data=False,
+    python_objects=False,
+    cache=None,
+    parallel=False,
+):
     """Parse all the Hy source code in ``stream``, which should be a textual file-like
     object or a string. ``filename``, if provided, is used in error messages. If no
     ``reader`` is provided, a new :class:`hy.HyReader` object is created. If
     ``skip_shebang`` is true and a :ref:`shebang line <shebang>` is present, it's
     detected and discarded first.
 
+    Ordinarily, all of ``stream`` is read up front, and the source text is kept
+    for error messages. If ``streaming`` is true, ``stream`` is instead read in
+    chunks as forms are requested, and only the source text around the current
+    form is kept, so memory use doesn't grow with the length of the stream. This
+    is useful for pipes, sockets, and big data files. The stream needn't be
+    seekable, but the returned object's ``source`` attribute is :data:`None`.
+
+    ``stream`` can also be a bytes-like object holding UTF-8 text, such as an
+    :class:`mmap.mmap` of a source file. Then it's decoded a chunk at a time as
+    forms are read, as if ``streaming`` were true, so a big file needn't be
+    copied into a string first.
+
+    If ``data`` is true, a new :class:`hy.HyReader` in data mode is used, which is
+    meant for loading data written as Hy literals: only the built-in reader macros
+    are available, and models don't get positions, which makes reading faster. If
+    ``python_objects`` is also true (it implies ``data``), each form is converted
+    to a plain Python object, so the result is much like that of an EDN or JSON
+    loader::
+
+        (list (hy.read-many "[1 \\"a\\" {:b #(None 2.5)}]" :python-objects True))
+          ; => [[1 "a" {:b #(None 2.5)}]]
+
+    In this case, any forms other than literal numbers, strings, bytes, lists,
+    tuples, sets, dictionaries, keywords, and the symbols ``True``, ``False``,
+    and ``None`` are an error. ``reader`` can't be provided along with ``data``
+    or ``python_objects``.
+
+    ``cache`` can be a :class:`hy.reader.ParseCache`, in which case the forms are
+    looked up in, or saved to, the cache. It's ignored when ``streaming``.
+
+    If ``parallel`` is true, and the source doesn't look like it defines or uses
+    any reader macros (which could change how later forms are read), the source
+    is split into chunks of top-level forms, which are read in a pool of
+    processes. ``parallel`` can be an integer to set the number of processes;
+    otherwise, there's one per CPU. All forms are read before the first is
+    returned. When the source can't safely be read this way, or ``reader`` has
+    extra reader macros, it's read normally. ``parallel`` is ignored when
+    ``streaming`` or ``cache`` is provided.
+
     Return a value of type :class:`hy.models.Lazy`. If you want to evaluate this, be
     careful to allow evaluating each model before reading the next, as in ``(hy.eval
     (hy.read-many o))``. By contrast, forcing all the code to be read before evaluating
@@ -27,32 +82,73 @@ def read_many(stream, filename="<string>", reader=None, skip_shebang=False):
        Thanks to reader macros, reading can execute arbitrary code. Don't read untrusted
        input."""
 
-    if isinstance(stream, str):
-        stream = StringIO(stream)
-    pos = stream.tell()
-    source = stream.read()
-    stream.seek(pos)
+    if isinstance(stream, _buffer_types):
+        stream = _UTF8Stream(stream)
+        streaming = True
+    if streaming:
+        source = None
+    elif isinstance(stream, str):
+        source = stream
+    else:
+        pos = stream.tell()
+        source = stream.read()
+        stream.seek(pos)
 
+    if data or python_objects:
+        if reader is not None:
+            raise ValueError("`reader` can't be used with `data` or `python_objects`")
+        reader = HyReader(data=data, python_objects=python_objects)
     reader = reader or HyReader()
-    m = hy.models.Lazy(reader.parse(
-        stream, filename, skip_shebang))
+    models = None
+    if parallel and cache is None and not streaming:
+        models = read_parallel(
+            source,
+            filename,
+            reader,
+            skip_shebang,
+            None if parallel is True else parallel,
+        )
+    if models is not None:
+        models = iter(models)
+    elif cache is not None and not streaming:
+        key = cache.key(source, filename, reader, skip_shebang)
+        models = cache.get(key, reader)
+        models = (
+            iter(models)
+            if models is not None
+            else cache.reading(
+                key, reader, reader.parse(source, filename, skip_shebang)
+            )
+        )
+    else:
+        models = reader.parse(
+            stream if streaming else source, filename, skip_shebang, streaming
+        )
+    m = hy.models.Lazy(models)
     m.source = source
     m.filename = filename
     m.reader = reader
     return m
 
 
-def read(stream, filename=None, reader=None):
+def read(stream, filename=None, reader=None, *, data=False, python_objects=False):
     """Like :hy:func:`hy.read-many`, but only one form is read, and shebangs are
     forbidden. The model corresponding to this specific form is returned, or, if there
     are no forms left in the stream, :class:`EOFError` is raised. ``stream.pos`` is left
     where it was immediately after the form."""
 
-    it = read_many(stream, filename, reader)
+    it = read_many(
+        stream, filename, reader, data=data, python_objects=python_objects
+    )
     try:
         m = next(it)
     except StopIteration:
         raise EOFError()
     else:
-        m.source, m.filename, m.reader = it.source, it.filename, it.reader
+        if not isinstance(stream, (str, *_buffer_types)):
+            # Leave `stream` just after the form, as if it had been read
+            # character by character.
+            stream.read(it.reader._index)
+        if not python_objects:
+            m.source, m.filename, m.reader = it.source, it.filename, it.reader
         return m
@@ -0,0 +1,143 @@
+"A cache of parse results, for tools that read the same files repeatedly."
+
+import hashlib
+import marshal
+import os
+from collections import OrderedDict
+
+import hy
+from hy.models import List, Sequence, dumps, loads
+
+# Bump this whenever the saved form of models changes incompatibly.
+CACHE_VERSION = 3
+
+
+def _reader_macro_id(name, fn):
+    code = getattr(fn, "__code__", None)
+    return "{}\0{}\0{}\0{}".format(
+        name,
+        getattr(fn, "__module__", ""),
+        getattr(fn, "__qualname__", type(fn).__qualname__),
+        hashlib.sha256(marshal.dumps(code)).hexdigest() if code else "",
+    )
+
+
+class ParseCache:
+    """An opt-in cache for :hy:func:`hy.read-many`, for tools (such as linters
+    and documentation builders) that read the same unchanged files many times.
+    Pass an instance as the ``cache`` argument of ``hy.read-many`` to use it.
+
+    Parse results are keyed by a hash of the source text, the filename, the
+    reader's class and settings, and its reader macros. Up to ``maxsize``
+    results are kept in memory, with the least recently used dropped first. If
+    ``directory`` is provided, results are also saved there as files, so they
+    can be reused by later processes. They're saved in the format of
+    :func:`hy.models.dumps`, which holds nothing but models, so loading them
+    can't run any code.
+
+    Each lookup returns fresh copies of the cached models, so callers are free
+    to modify them. Only the built-in model types are saved, along with their
+    positions; any other attributes that reader macros set on models are lost.
+    Results are only cached once all the forms have been read,
+    and not at all if the set of reader macros changed while reading, as when a
+    file defines a reader macro and uses it later on. Reading such a file
+    depends on evaluating it, so it's simply read anew each time."""
+
+    def __init__(self, maxsize=128, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries = OrderedDict()
+
+    def key(self, source, filename, reader, skip_shebang=False):
+        "Return the cache key for reading ``source`` with ``reader``."
+        h = hashlib.sha256()
+        for part in (
+            str(CACHE_VERSION),
+            hy.__version__,
+            f"{type(reader).__module__}.{type(reader).__qualname__}",
+            repr((
+                filename,
+                skip_shebang,
+                reader.bracketed_templates,
+                reader.data,
+                reader.python_objects,
+            )),
+            *sorted(_reader_macro_id(k, v) for k, v in reader.reader_macros.items()),
+            source,
+        ):
+            h.update(part.encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".hymodels")
+
+    def get(self, key, reader):
+        """Return a list of the models cached under ``key``, with their
+        ``reader`` attributes set to ``reader``, or :data:`None` on a miss.
+        A file in ``directory`` that isn't a valid dump counts as a miss."""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            models = loads(data)
+        elif self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as o:
+                    data = o.read()
+            except OSError:
+                return None
+            try:
+                models = loads(data)
+            except ValueError:
+                return None
+            self._remember(key, data)
+        else:
+            return None
+        if reader.python_objects:
+            return [reader.as_python(m) for m in models]
+        if not reader.data:
+            stack = [models]
+            while stack:
+                for m in stack.pop():
+                    m.reader = reader
+                    if isinstance(m, Sequence):
+                        stack.append(m)
+        return list(models)
+
+    def put(self, key, models):
+        """Cache the list ``models`` under ``key``. Nothing is cached if
+        they can't be saved, as when a reader macro returned a model of a
+        type of its own."""
+        try:
+            data = dumps(List(models))
+        except TypeError:
+            return
+        self._remember(key, data)
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as o:
+                o.write(data)
+            os.replace(tmp, self._path(key))
+
+    def _remember(self, key, data):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        "Empty the in-memory layer of the cache."
+        self._entries.clear()
+
+    def reading(self, key, reader, models):
+        """Yield from the iterable ``models``, which ``reader`` is producing,
+        and cache the forms read under ``key`` if reading finishes without
+        the reader macros changing."""
+        macros_before = dict(reader.reader_macros)
+        out = []
+        for model in models:
+            out.append(model)
+            yield model
+        if reader.reader_macros == macros_before:
+            self.put(key, out)
@@ -5,7 +5,7 @@ class LexException(HySyntaxError):
     @classmethod
     def from_reader(cls, message, reader):
         return cls(
-            message, None, reader._filename, reader._source, *reader._eof_tracker
+            message, None, reader._filename, reader._error_source, *reader._eof_tracker
         )
 
 
@@ -2,7 +2,10 @@
 
 import codecs
 import inspect
+import re
+from bisect import bisect_left
 from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 from itertools import islice
 
 import hy
@@ -17,16 +20,33 @@ from hy.models import (
     Integer,
     Keyword,
     List,
+    Object,
+    Sequence,
     Set,
     String,
     Symbol,
     Tuple,
     as_model,
+    fill_missing_pos,
+    strip_digit_separators,
 )
 
 from .exceptions import LexException, PrematureEndOfInput
 from .reader import Reader, isnormalizedspace
 
+_space_chars = " \t\n\r\f\v"
+
+
+@lru_cache
+def _ident_regex(ends_ident):
+    "Compile a regex matching a run of characters not in ``ends_ident``."
+    return re.compile(
+        "[^{}]*".format("".join(map(re.escape, sorted(ends_ident | set(_space_chars)))))
+    )
+
+
+_space_and_comments = re.compile(r"(?:[ \t\n\r\f\v]+|;[^\n]*)+")
+
 
 def sym(name):
     return Symbol(name, from_parser=True)
@@ -38,6 +58,56 @@ def mkexpr(root, *args):
     return Expression((sym(root) if isinstance(root, str) else root, *args))
 
 
+# A numeric literal, after digit separators have been stripped, has to
+# start with one of these.
+_number_start = re.compile(r"[+-]?(?:[0-9]|\.[0-9]|inf|nan|j)", re.I | re.A)
+_float = r"(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|inf|infinity|nan)"
+_integer_literal = re.compile(
+    r"[+-]?(?:0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+|[1-9][0-9]*|0+)"
+)
+_float_literal = re.compile(rf"[+-]?{_float}", re.I | re.A)
+_complex_literal = re.compile(
+    rf"[+-]?(?:{_float}[+-])?{_float}?j", re.I | re.A
+)
+
+
+def _try_numbers(ident):
+    for model in (Integer, Float, Complex):
+        try:
+            return model(ident)
+        except ValueError:
+            pass
+    return None
+
+
+def as_number(ident):
+    """Return an `Integer`, `Float`, or `Complex` for ``ident``, whichever of
+    them accepts it first, or `None` if none does. Plain symbols are
+    rejected without trying (and failing) to construct each type."""
+
+    if ident in ("j", "J"):
+        return None
+    if not ident.isascii() or not ident.isprintable() or " " in ident:
+        # Python's numeric constructors also accept non-ASCII digits
+        # and surrounding whitespace, so let them decide.
+        if any(c.isdecimal() or c.isspace() for c in ident):
+            return _try_numbers(ident)
+    stripped = strip_digit_separators(ident)
+    if not _number_start.match(stripped):
+        return None
+    if (ident.isascii() and ident.isdigit()) or _integer_literal.fullmatch(stripped):
+        return Integer(ident)
+    try:
+        if _float_literal.fullmatch(stripped):
+            return Float(ident)
+        if _complex_literal.fullmatch(stripped):
+            return Complex(ident)
+    except ValueError:
+        # Only a wrongly capitalized `Inf` or `NaN` gets here.
+        pass
+    return None
+
+
 def as_identifier(ident, reader=None):
     """Generate a Hy model from an identifier.
 
@@ -55,19 +125,9 @@ def as_identifier(ident, reader=None):
     -------
     out : a hy.models.Object subtype corresponding to the parsed text.
     """
-    try:
-        return Integer(ident)
-    except ValueError:
-        pass
-    try:
-        return Float(ident)
-    except ValueError:
-        pass
-    if ident not in ("j", "J"):
-        try:
-            return Complex(ident)
-        except ValueError:
-            pass
+    number = as_number(ident)
+    if number is not None:
+        return number
 
     if "." in ident:
         if not ident.strip("."):
@@ -109,12 +169,69 @@ def as_identifier(ident, reader=None):
     return sym(ident)
 
 
+def _shift_pos(tree, line, lines, columns):
+    """Move every position in ``tree`` down by ``lines`` lines, first moving
+    those on line ``line`` right by ``columns`` columns."""
+    stack = [tree]
+    while stack:
+        m = stack.pop()
+        if not isinstance(m, Object):
+            continue
+        if hasattr(m, "_start_line"):
+            if m._start_line == line:
+                m._start_column += columns
+            if m._end_line == line:
+                m._end_column += columns
+            m._start_line += lines
+            m._end_line += lines
+        if isinstance(m, Sequence):
+            stack.extend(m)
+
+
+class ParseResult:
+    """All the forms read from a string by :meth:`HyReader.parse_all` or
+    :meth:`HyReader.reparse`. Iterating over it yields the models.
+
+    Attributes:
+        source (str): The source text.
+        filename (str): The filename used for positions and errors.
+        models (list): The model for each top-level form.
+        spans (list[tuple[int, int]]): For each model, the offsets in
+            ``source`` of the start and end of its form."""
+
+    def __init__(self, source, filename, skip_shebang, models, starts, ends):
+        self.source = source
+        self.filename = filename
+        self.skip_shebang = skip_shebang
+        self.models = models
+        self._starts = starts
+        self._ends = ends
+
+    @property
+    def spans(self):
+        return list(zip(self._starts, self._ends))
+
+    def __iter__(self):
+        return iter(self.models)
+
+    def __len__(self):
+        return len(self.models)
+
+
 class HyReader(Reader):
     """A modular reader for Hy source. It inherits from
     :py:class:`hy.Reader`.
 
     When ``use_current_readers`` is true, initialize this reader
-    with all reader macros from the calling module."""
+    with all reader macros from the calling module.
+
+    When ``data`` is true, the reader is meant for loading data written as
+    Hy literals rather than for reading code. It has only the built-in reader
+    macros, it isn't made the current reader while reading (so reader macros
+    defined at read-time can't affect it), and models aren't given position
+    information. If ``python_objects`` is true, which implies ``data``,
+    :meth:`parse` yields plain Python objects instead of models: see
+    :hy:func:`hy.read-many`."""
 
     __module__ = 'hy'
 
@@ -125,10 +242,22 @@ class HyReader(Reader):
     NON_IDENT = set("()[]{};\"'`~")
     _current_reader = None
 
-    def __init__(self, *, use_current_readers=False, bracketed_templates=False):
+    def __init__(
+        self,
+        *,
+        use_current_readers=False,
+        bracketed_templates=False,
+        data=False,
+        python_objects=False,
+    ):
         super().__init__()
 
         self.bracketed_templates = bracketed_templates
+        self.python_objects = python_objects
+        self.data = data or python_objects
+        if self.data and use_current_readers:
+            raise ValueError("A data reader can't use the current reader macros")
+        self._ident_re = _ident_regex(frozenset(self.NON_IDENT))
 
         # move any reader macros declared using
         # `reader_for("#...")` to the macro table
@@ -170,9 +299,31 @@ class HyReader(Reader):
 
         model.start_line, model.start_column = start
         model.end_line, model.end_column = self.pos
-        return model.replace(model)
-          # `replace` will recurse into submodels and set any model
-          # positions that are still unset the same way.
+        return fill_missing_pos(model, model)
+          # Submodels that haven't been positioned yet (such as the
+          # `quote` in `'x`) get the same position. Those that were
+          # read as forms of their own already have one, so each
+          # model is visited only once.
+
+    def read_ident(self, just_peeking=False):
+        # Consume the whole identifier with one regex match, unless
+        # `ends_ident` has been changed (e.g., by `end_identifier`).
+        if self.ends_ident != self.NON_IDENT:
+            return super().read_ident(just_peeking)
+        ident = self._match(self._ident_re).group()
+        if not just_peeking:
+            self._advance(len(ident))
+        return ident
+
+    def _skip_space_and_comments(self):
+        """Consume whitespace and line comments in one go, provided that
+        ``;`` still has its default meaning."""
+        if self.reader_table.get(";") is HyReader.line_comment:
+            m = self._match(_space_and_comments)
+            if m:
+                self._advance(m.end() - m.start())
+        else:
+            self.slurp_space()
 
     def read_default(self, key):
         """Try to read an identifier. If the next character after that is
@@ -187,19 +338,168 @@ class HyReader(Reader):
             return self.prefixed_string('"', ident)
         return as_identifier(ident, reader=self)
 
-    def parse(self, stream, filename=None, skip_shebang=False):
-        """Yield all models in ``stream``. The parameters are understood as in
+    def parse(self, stream, filename=None, skip_shebang=False, streaming=False):
+        """Yield all models in ``stream``, which can be a textual file-like
+        object or a string. The parameters are understood as in
         :hy:func:`hy.read-many`."""
 
-        self._set_source(stream, filename)
+        self._set_source(stream, filename, streaming)
+        if skip_shebang:
+            self._skip_shebang()
 
-        if skip_shebang and "".join(
-                islice(self.peeking(eof_ok = True), len("#!"))) == "#!":
+        for model in self.parse_forms_until(""):
+            yield self.as_python(model) if self.python_objects else model
+            self._discard_consumed()
+
+    def _skip_shebang(self):
+        if "".join(islice(self.peeking(eof_ok = True), len("#!"))) == "#!":
             for c in self.chars():
                 if c == "\n":
                     break
 
-        yield from self.parse_forms_until("")
+    def parse_all(self, source, filename="<string>", skip_shebang=False):
+        """Read all the forms in the string ``source`` and return them as a
+        :class:`ParseResult`, which can later be passed to :meth:`reparse`.
+        The other parameters are understood as in :hy:func:`hy.read-many`."""
+        models, starts, ends = self._parse_from(source, 0, filename, skip_shebang)
+        return ParseResult(source, filename, skip_shebang, models, starts, ends)
+
+    def reparse(self, previous, offset, deleted, inserted):
+        """Return a new :class:`ParseResult` for the source of the
+        :class:`ParseResult` ``previous`` after an edit, which replaces the
+        ``deleted`` characters at ``offset`` with the string ``inserted``.
+
+        Only the top-level forms that the edit touches are read again, so this
+        is much faster than reading the whole source anew, as a text editor
+        might do after each keystroke. Reading resumes after the last form
+        that ends before the edit, and stops as soon as it's past the edit and
+        at the end of one of the old forms. The models for the other forms are
+        reused, and the positions of those after the edit are updated in place,
+        so ``previous`` shouldn't be used afterwards. If reading raises an
+        exception, though, nothing is changed."""
+
+        old = previous.source
+        if not (0 <= offset and 0 <= deleted and offset + deleted <= len(old)):
+            raise ValueError("The edit is out of range")
+        source = old[:offset] + inserted + old[offset + deleted :]
+        edit_end = offset + len(inserted)
+        delta = len(inserted) - deleted
+        starts, ends = previous._starts, previous._ends
+
+        # The forms that end before the edit can be kept as they are.
+        n = bisect_left(ends, offset)
+        start = ends[n - 1] if n else 0
+
+        # Read forms until we're past the edit and back in step with the
+        # old forms, after which the old forms are `previous.models[k:]`.
+        k = len(ends)
+
+        def in_step(end):
+            nonlocal k
+            i = bisect_left(ends, end - delta)
+            if end >= edit_end and i < len(ends) and ends[i] == end - delta:
+                k = i + 1
+                return True
+            return False
+
+        new_models, new_starts, new_ends = self._parse_from(
+            source,
+            start,
+            previous.filename,
+            previous.skip_shebang and not n,
+            in_step,
+        )
+
+        tail = previous.models[k:]
+        if tail and not self.data:
+            old_end = offset + deleted
+            line = old.count("\n", 0, old_end) + 1
+            lines = inserted.count("\n") - old.count("\n", offset, old_end)
+            columns = (edit_end - source.rfind("\n", 0, edit_end)) - (
+                old_end - old.rfind("\n", 0, old_end)
+            )
+            if lines or columns:
+                for model in tail:
+                    if not lines and model.start_line > line:
+                        # The remaining forms are all on later lines.
+                        break
+                    _shift_pos(model, line, lines, columns)
+
+        return ParseResult(
+            source,
+            previous.filename,
+            previous.skip_shebang,
+            previous.models[:n] + new_models + tail,
+            starts[:n] + new_starts + [i + delta for i in starts[k:]],
+            ends[:n] + new_ends + [i + delta for i in ends[k:]],
+        )
+
+    def _parse_from(self, source, start, filename, skip_shebang, stop=None):
+        """Read the forms of ``source`` from offset ``start``, returning lists
+        of the models and the offsets at which each starts and ends. If
+        ``stop`` is provided, it's called with the end offset of each form,
+        and reading stops after the first form for which it returns true."""
+        self._set_source(source[start:], filename)
+        self._base_line = source.count("\n", 0, start) + 1
+        self._base_col = start - (source.rfind("\n", 0, start) + 1)
+        if skip_shebang:
+            self._skip_shebang()
+
+        models, starts, ends = [], [], []
+        while True:
+            self._skip_space_and_comments()
+            if not self.peekc():
+                break
+            i = self._index
+            model = self.try_parse_one_form()
+            if model is None:
+                continue
+            models.append(self.as_python(model) if self.python_objects else model)
+            starts.append(start + i)
+            ends.append(start + self._index)
+            if stop is not None and stop(ends[-1]):
+                break
+        return models, starts, ends
+
+    _python_constants = {"True": True, "False": False, "None": None}
+    _python_types = {
+        Integer: int,
+        Float: float,
+        Complex: complex,
+        String: str,
+        Bytes: bytes,
+        List: list,
+        Tuple: tuple,
+        Set: set,
+    }
+
+    def as_python(self, model):
+        """Convert a model read in data mode into the corresponding Python
+        object. Literal numbers, strings, lists, tuples, sets, and dictionaries
+        are converted recursively, the symbols ``True``, ``False``, and ``None``
+        become the corresponding constants, and keywords are left as
+        :class:`hy.models.Keyword` objects. Anything else is an error."""
+
+        t = type(model)
+        if t is Keyword:
+            return model
+        if t is Symbol and str(model) in self._python_constants:
+            return self._python_constants[str(model)]
+        if t is Dict:
+            if len(model) % 2:
+                raise LexException.from_reader(
+                    "A dictionary literal needs an even number of forms", self
+                )
+            return dict(
+                zip(map(self.as_python, model[::2]), map(self.as_python, model[1::2]))
+            )
+        if t in (List, Tuple, Set):
+            return self._python_types[t](map(self.as_python, model))
+        if t in self._python_types:
+            return self._python_types[t](model)
+        raise LexException.from_reader(
+            f"Can't convert {hy.repr(model)} to a Python object", self
+        )
 
     ###
     # Reading forms
@@ -221,15 +521,18 @@ class HyReader(Reader):
                 fully parsing a form.
             LexException: If there is an error during form parsing.
         """
-        with self.as_current_reader():
+        with nullcontext() if self.data else self.as_current_reader():
             try:
                 self.slurp_space()
                 c = self.getc()
-                start = self._pos
                 if not c:
                     raise PrematureEndOfInput.from_reader(
                         "Premature end of input while attempting to parse one form", self
                     )
+                if self.data:
+                    handler = self.reader_table.get(c)
+                    return handler(self, c) if handler else self.read_default(c)
+                start = self.pos
                 handler = self.reader_table.get(c)
                 model = handler(self, c) if handler else self.read_default(c)
                 if model is not None:
@@ -256,7 +559,7 @@ class HyReader(Reader):
         """Yield models until the character ``closer`` is seen. This method is
         useful for reading sequential constructs such as lists."""
         while True:
-            self.slurp_space()
+            self._skip_space_and_comments()
             if self.peek_and_getc(closer):
                 break
             model = self.try_parse_one_form()
@@ -277,7 +580,10 @@ class HyReader(Reader):
 
     @reader_for(";")
     def line_comment(self, _):
-        any(c == "\n" for c in self.chars(eof_ok=True))
+        end = self._source.find("\n", self._index)
+        while end == -1 and self._more():
+            end = self._source.find("\n", self._index)
+        self._advance((len(self._source) if end == -1 else end + 1) - self._index)
         return None
 
     @reader_for(":")
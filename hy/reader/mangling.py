@@ -1,5 +1,6 @@
 import re
 import unicodedata
+from functools import lru_cache
 
 MANGLE_DELIM = "X"
 
@@ -30,8 +31,26 @@ def mangle(s):
     """
 
     assert s
-    s = str(s)
+    return _mangle(str(s))
 
+
+# The compiler mangles the same names over and over, so remember the
+# results. Nearly all of them are plain ASCII names, which can skip
+# everything but the handling of hyphens.
+
+
+@lru_cache(maxsize=4096)
+def _mangle(s):
+    if s.isascii():
+        s2 = s.lstrip("_")
+        s2 = s[: len(s) - len(s2)] + s2[:1] + s2[1:].replace("-", "_")
+        if s2.isidentifier():
+            # ASCII is already normalized.
+            return s2
+    return _mangle_by_rules(s)
+
+
+def _mangle_by_rules(s):
     if "." in s and s.strip("."):
         return ".".join(mangle(x) if x else "" for x in s.split("."))
 
@@ -85,17 +104,25 @@ def unmangle(s):
     "hyx_XpizzazzX")`` is erroneous, because there is no Unicode character
     named "PIZZAZZ" (yet)."""
 
-    s = str(s)
+    return _unmangle(str(s))
+
+
+_mangled_char = re.compile("{0}(U)?([_a-z0-9H]+?){0}".format(MANGLE_DELIM))
+
 
+@lru_cache(maxsize=4096)
+def _unmangle(s):
     prefix = ""
     suffix = ""
-    m = re.fullmatch(r"(_+)(.*?)(_*)", s, re.DOTALL)
-    if m:
-        prefix, s, suffix = m.groups()
+    if s.startswith("_"):
+        # Set aside the leading underscores, and then any trailing ones.
+        core = s.lstrip("_")
+        prefix = s[: len(s) - len(core)]
+        s = core.rstrip("_")
+        suffix = core[len(s) :]
 
     if s.startswith("hyx_"):
-        s = re.sub(
-            "{0}(U)?([_a-z0-9H]+?){0}".format(MANGLE_DELIM),
+        s = _mangled_char.sub(
             lambda mo: chr(int(mo.group(2), base=16))
             if mo.group(1)
             else unicodedata.lookup(
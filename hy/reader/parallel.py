@@ -0,0 +1,164 @@
+"Reading the top-level forms of a source in parallel."
+
+import io
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .hy_reader import HyReader
+
+_token = re.compile(
+    r"""
+    (?P<space> [ \t\n\r\f\v]+ )
+  | (?P<comment> ;[^\n]* )
+  | (?P<string> "(?:[^"\\]|\\.)*" )
+  | (?P<bracket_string> \#\[ (?P<delim>[^\[\]]*) \[ .*? \] (?P=delim) \] )
+  | (?P<open> [(\[{] | \#[({] )
+  | (?P<close> [)\]}] )
+  | (?P<prefix> ['`] | ~@? | \#\*\*? | \#_ )
+  | (?P<annotate> \#\^ )
+  | (?P<tag> \# )
+  | (?P<atom> [^ \t\n\r\f\v()\[\]{};"'`~]+ )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Signs that reading may depend on reader macros that the source itself
+# defines or requires.
+_reader_macro_hint = re.compile(r"defreader|:readers")
+
+
+class _ModelPickler(pickle.Pickler):
+    # Readers can't be pickled, so store a placeholder for them, and
+    # substitute the reader doing the loading when unpickling.
+    def persistent_id(self, obj):
+        return "reader" if isinstance(obj, HyReader) else None
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    def __init__(self, file, reader):
+        super().__init__(file)
+        self.reader = reader
+
+    def persistent_load(self, pid):
+        return self.reader
+
+
+def split_forms(source, start=0):
+    """Return a list of offsets in ``source``, beginning with ``start``,
+    at which a new line starts between top-level forms. Only the built-in
+    syntax is understood, so return `None` if ``source`` might use or define
+    reader macros, or if it isn't well-formed."""
+
+    if _reader_macro_hint.search(source, start):
+        return None
+    splits = [start]
+    depth = 0
+    # The number of forms still needed to complete the current
+    # top-level form, as after `'`
+    pending = 0
+    pos = start
+    while pos < len(source):
+        m = _token.match(source, pos)
+        if not m:
+            return None
+        kind = m.lastgroup
+        if kind == "space":
+            if not depth and not pending and "\n" in m.group():
+                splits.append(m.start() + m.group().rindex("\n") + 1)
+        elif kind == "open":
+            depth += 1
+        elif kind == "close":
+            if not depth:
+                return None
+            depth -= 1
+        elif kind == "prefix":
+            if not depth:
+                pending += 1
+        elif kind == "annotate":
+            if not depth:
+                pending += 2
+        elif kind == "tag":
+            return None
+        if pending and not depth and kind in ("close", "string", "bracket_string", "atom"):
+            pending -= 1
+        pos = m.end()
+    if depth or pending:
+        return None
+    return splits
+
+
+def _read_chunk(chunk, filename, line, reader_args):
+    reader = HyReader(**reader_args)
+    reader._set_source(chunk, filename)
+    reader._base_line = line
+    forms = list(reader.parse_forms_until(""))
+    if reader.python_objects:
+        forms = list(map(reader.as_python, forms))
+    f = io.BytesIO()
+    _ModelPickler(f, pickle.HIGHEST_PROTOCOL).dump(forms)
+    return f.getvalue()
+
+
+def read_parallel(source, filename, reader, skip_shebang=False, max_workers=None):
+    """Read ``source`` by splitting it into chunks of top-level forms and
+    reading the chunks in a pool of ``max_workers`` processes. Return a list
+    of the models, or `None` if the source can't be split safely (see
+    :func:`split_forms`) or ``reader`` has anything beyond the default
+    reader settings, in which case it should be read normally."""
+
+    default = HyReader()
+    if (
+        type(reader) is not HyReader
+        or reader.reader_macros != default.reader_macros
+        or reader.reader_table != default.reader_table
+        or reader.ends_ident != default.ends_ident
+    ):
+        return None
+    start = 0
+    if skip_shebang and source.startswith("#!"):
+        start = source.find("\n") + 1 or len(source)
+    splits = split_forms(source, start)
+    if splits is None:
+        return None
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2:
+        return None
+    # Make a few chunks per worker, of roughly equal size.
+    target = max(len(source) // (4 * max_workers), 1)
+    bounds = [start]
+    for i in splits:
+        if i - bounds[-1] >= target:
+            bounds.append(i)
+    bounds.append(len(source))
+    if len(bounds) < 3:
+        return None
+
+    reader_args = dict(
+        bracketed_templates=reader.bracketed_templates,
+        data=reader.data,
+        python_objects=reader.python_objects,
+    )
+    chunks = [source[a:b] for a, b in zip(bounds, bounds[1:])]
+    lines = [source.count("\n", 0, a) + 1 for a in bounds[:-1]]
+    try:
+        with ProcessPoolExecutor(max_workers) as pool:
+            results = list(
+                pool.map(
+                    _read_chunk,
+                    chunks,
+                    [filename] * len(chunks),
+                    lines,
+                    [reader_args] * len(chunks),
+                )
+            )
+    except Exception:
+        # Let reading the source normally produce the error.
+        return None
+    return [
+        model
+        for data in results
+        for model in _ModelUnpickler(io.BytesIO(data), reader).load()
+    ]
@@ -1,8 +1,9 @@
 "Tooling for reading/parsing source character-by-character."
 
-import itertools
+import codecs
 import re
-from collections import deque
+from bisect import bisect_right
+from collections.abc import Sequence
 from contextlib import contextmanager
 
 from .exceptions import PrematureEndOfInput
@@ -14,6 +15,71 @@ def isnormalizedspace(s):
     return bool(_whitespace.match(s))
 
 
+class _SavedChars(Sequence):
+    """The list of characters yielded by :meth:`Reader.saving_chars`. It
+    grows as the reader consumes characters. The characters are kept in a
+    list that's only extended with the new ones, so indexing it in a loop
+    is cheap."""
+
+    def __init__(self, reader):
+        self._reader = reader
+        # The offset in the reader's buffer of the first saved character
+        self._start = reader._index
+        self._chars = []
+
+    def _list(self):
+        reader = self._reader
+        if reader is not None:
+            end = reader._index - self._start
+            if len(self._chars) < end:
+                self._chars += reader._source[self._start + len(self._chars) :
+                                              self._start + end]
+        return self._chars
+
+    def _stop(self):
+        self._list()
+        self._reader = None
+
+    def __getitem__(self, i):
+        return self._list()[i]
+
+    def __len__(self):
+        return len(self._list())
+
+    def __iter__(self):
+        return iter(self._list())
+
+    def __eq__(self, other):
+        return self._list() == (other._list() if isinstance(other, _SavedChars) else other)
+
+    def __repr__(self):
+        return repr(self._list())
+
+
+class _UTF8Stream:
+    """A text stream over a bytes-like object of UTF-8, such as an
+    :class:`mmap.mmap` of a file. Only as much as is read is decoded, so
+    reading a large file this way needn't copy all of it into a string."""
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._offset = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def read(self, n=-1):
+        buffer = self._buffer
+        if n is None or n < 0:
+            n = len(buffer)
+        text = ""
+        # A chunk may end partway through a character, so keep going
+        # until we have something to return or we're at the end.
+        while not text and self._offset < len(buffer):
+            chunk = buffer[self._offset : self._offset + n]
+            self._offset += len(chunk)
+            text = self._decoder.decode(chunk, self._offset >= len(buffer))
+        return text
+
+
 class ReaderMeta(type):
     """Provides a class with a dispatch map `DEFAULT_TABLE`
     and a decorator `@reader_for`."""
@@ -63,30 +129,135 @@ class Reader(metaclass=ReaderMeta):
 
     __module__ = 'hy'
 
+    CHUNK_SIZE = 1 << 16
+
     def __init__(self):
         self._source = None
         self._filename = None
+        self._saving = []
 
         self.ends_ident = set(self.NON_IDENT)
         self.reader_table = self.DEFAULT_TABLE.copy()
 
-    def _set_source(self, stream=None, filename=None):
+    def _set_source(self, stream=None, filename=None, streaming=False):
         if filename is not None:
             self._filename = filename
         if stream is not None:
-            pos = stream.tell()
-            self._source = stream.read()
-            stream.seek(pos)
+            if isinstance(stream, str):
+                # Use the string itself as the source, without copying it.
+                self._source = stream
+                self._stream_done = True
+                stream = None
+                streaming = False
+            elif streaming:
+                # Read `stream` lazily, `CHUNK_SIZE` characters at a
+                # time, and keep only a window of the source around
+                # the form being read.
+                self._source = ""
+                self._stream_done = False
+            else:
+                start = stream.tell()
+                self._source = stream.read()
+                stream.seek(start)
+                self._stream_done = True
 
             self._stream = stream
-            self._peek_chars = deque()
-            self._saved_chars = []
-            self._pos = (1, 0)
-            self._eof_tracker = self._pos
+            self._streaming = streaming
+            self._index = 0
+            self._eof_index = 0
+            # `_source` may be a window onto a larger source, in which
+            # case it begins at this position of the whole source.
+            self._base_line, self._base_col = 1, 0
+            # The offsets in `_source` at which lines start, up to
+            # offset `_lines_scanned`
+            self._line_starts = []
+            self._lines_scanned = 0
+
+    def _more(self):
+        """Append the next chunk of the stream to the buffer, returning
+        false if the stream is exhausted."""
+        if self._stream_done:
+            return False
+        # Read bigger chunks as the buffer grows, so a long form
+        # doesn't cost quadratic time to accumulate.
+        chunk = self._stream.read(max(self.CHUNK_SIZE, len(self._source)))
+        if not chunk:
+            self._stream_done = True
+            return False
+        self._source += chunk
+        return True
+
+    def _match(self, regex):
+        """Match ``regex`` at the cursor without consuming anything,
+        reading more of the stream first if the match could go on past
+        the end of the buffer."""
+        while True:
+            m = regex.match(self._source, self._index)
+            if (m.end() if m else self._index) < len(self._source) or not self._more():
+                return m
+
+    def _discard_consumed(self):
+        """When streaming, drop already consumed source text from the
+        buffer once it's grown large enough to be worth it."""
+        if not self._streaming:
+            return
+        # Keep the text that any `saving_chars` block still needs.
+        cut = min(self._index, self._eof_index, *(s._start for s in self._saving))
+        if cut < max(self.CHUNK_SIZE, len(self._source) // 2):
+            return
+        self._scan_lines(cut)
+        starts = self._line_starts
+        n = bisect_right(starts, cut)
+        if n:
+            self._base_line += n
+            self._base_col = cut - starts[n - 1]
+        else:
+            self._base_col += cut
+        self._line_starts = [i - cut for i in starts[n:]]
+        self._lines_scanned -= cut
+        self._source = self._source[cut:]
+        self._index -= cut
+        self._eof_index -= cut
+        for saved in self._saving:
+            saved._start -= cut
+
+    def _scan_lines(self, index):
+        # Only scan as far as needed, so finding a position near the
+        # start of a long buffer stays cheap.
+        if index > self._lines_scanned:
+            source = self._source
+            i = source.find("\n", self._lines_scanned, index)
+            while i != -1:
+                self._line_starts.append(i + 1)
+                i = source.find("\n", i + 1, index)
+            self._lines_scanned = index
+
+    def _pos_at(self, index):
+        "Return the (line, column) position at buffer offset ``index``."
+        self._scan_lines(index)
+        n = bisect_right(self._line_starts, index)
+        return (
+            (self._base_line + n, index - self._line_starts[n - 1])
+            if n
+            else (self._base_line, self._base_col + index)
+        )
 
     @property
     def pos(self):
-        return self._pos
+        return self._pos_at(self._index)
+
+    @property
+    def _eof_tracker(self):
+        # The position of the last non-whitespace character consumed.
+        return self._pos_at(self._eof_index)
+
+    @property
+    def _error_source(self):
+        # The source text for error messages. When streaming, pad the
+        # window so that line and column numbers still line up.
+        if self._base_line == 1 and self._base_col == 0:
+            return self._source
+        return "\n" * (self._base_line - 1) + " " * self._base_col + self._source
 
     @contextmanager
     def end_identifier(self, character):
@@ -106,40 +277,34 @@ class Reader(metaclass=ReaderMeta):
 
     @contextmanager
     def saving_chars(self):
-        """A context manager to save all read characters. The value is a list
-        of characters, rather than a single string."""
-
-        self._saved_chars.append([])
-        yield self._saved_chars[-1]
-        saved = self._saved_chars.pop()
-        if self._saved_chars:
-            # `saving_chars` is being used recursively. The
-            # characters we collected for the inner case should also
-            # be saved for the outer case.
-            self._saved_chars[-1].extend(saved)
+        """A context manager to save all read characters. The value is a
+        read-only sequence of characters, rather than a single string, which
+        grows as characters are read until the block ends."""
+
+        saved = _SavedChars(self)
+        self._saving.append(saved)
+        try:
+            yield saved
+        finally:
+            self._saving.remove(saved)
+            saved._stop()
 
     def peekc(self):
         "Peek at the next character, returning it but not consuming it."
-        if self._peek_chars:
-            return self._peek_chars[-1]
-        nc = self._stream.read(1)
-        self._peek_chars.append(nc)
-        return nc
+        if self._index >= len(self._source):
+            self._more()
+        return self._source[self._index : self._index + 1]
 
     def peeking(self, eof_ok=False):
         """As :func:`chars`, but without consuming any of the returned
         characters. This method is useful for looking several characters
         ahead."""
 
-        for nc in reversed(self._peek_chars):
-            yield nc
-        while True:
-            c = self._stream.read(1)
-            if not c:
-                break
-            self._peek_chars.appendleft(c)
-            yield c
-        if not c and not eof_ok:
+        i = self._index
+        while i < len(self._source) or self._more():
+            yield self._source[i]
+            i += 1
+        if not eof_ok:
             raise PrematureEndOfInput.from_reader(
                 "Premature end of input while peeking", self
             )
@@ -150,30 +315,17 @@ class Reader(metaclass=ReaderMeta):
         should go through it."""
 
         c = self.peekc()
-        self._peek_chars.pop()
-
         if c:
-            line, col = self._pos
-            col += 1
-            if c == "\n":
-                line += 1
-                col = 0
-            self._pos = (line, col)
-
+            self._index += 1
             if not isnormalizedspace(c):
-                self._eof_tracker = self._pos
-
-        if self._saved_chars:
-            self._saved_chars[-1].append(c)
-
+                self._eof_index = self._index
         return c
 
     def peek_and_getc(self, target):
         """Peek at the next character and check if it's equal to ``target``,
         only consuming it if it's equal. A :py:class:`bool` is returned."""
 
-        nc = self.peekc()
-        if nc == target:
+        if self.peekc() == target:
             self.getc()
             return True
         return False
@@ -188,7 +340,7 @@ class Reader(metaclass=ReaderMeta):
             if not c:
                 break
             yield c
-        if not c and not eof_ok:
+        if not eof_ok:
             raise PrematureEndOfInput.from_reader(
                 "Premature end of input while streaming chars", self
             )
@@ -197,32 +349,49 @@ class Reader(metaclass=ReaderMeta):
     # Reading multiple characters
     ###
 
+    def _advance(self, n):
+        "Consume ``n`` characters (which must be buffered) and return them."
+        start = self._index
+        self._index += n
+        s = self._source[start : self._index]
+        kept = len(s.rstrip(" \t\n\r\f\v"))
+        if kept:
+            self._eof_index = start + kept
+        return s
+
     def getn(self, n):
         "Consume and return ``n`` characters."
-        return "".join(itertools.islice(self.chars(), n))
+        while len(self._source) - self._index < n:
+            if not self._more():
+                self._advance(len(self._source) - self._index)
+                raise PrematureEndOfInput.from_reader(
+                    "Premature end of input while streaming chars", self
+                )
+        return self._advance(n)
 
     def slurp_space(self):
         "Consume and return zero or more whitespace characters."
-        n = 0
-        for c in self.peeking(eof_ok=True):
-            if not isnormalizedspace(c):
-                break
-            n += 1
-        return self.getn(n)
+        m = self._match(_whitespace)
+        if not m:
+            return ""
+        self._index = m.end()
+        return m.group()
 
     def read_ident(self, just_peeking=False):
         """Read characters until we hit something in :py:attr:`ends_ident`. The
         characters are consumed unless ``just_peeking`` is true."""
 
-        ident = []
-        for nc in self.peeking(eof_ok=True):
-            if not nc or nc in self.ends_ident or isnormalizedspace(nc):
-                # `not nc` means EOF, but that's okay.
+        ends_ident = self.ends_ident
+        end = self._index
+        while end < len(self._source) or self._more():
+            c = self._source[end]
+            if c in ends_ident or isnormalizedspace(c):
                 break
-            ident.append(nc)
+            end += 1
+        ident = self._source[self._index : end]
         if not just_peeking:
-            self.getn(len(ident))
-        return "".join(ident)
+            self._advance(len(ident))
+        return ident
 
     ###
     # Reader dispatch logic
@@ -41,33 +41,70 @@ class OuterVar(ast.stmt):
         self.names = names
 
 
-class ResolveOuterVars(ast.NodeTransformer):
-    "Find all OuterVar nodes and replace with Nonlocal or Global as necessary."
-    def visit_OuterVar(self, node):
-        from hy.compiler import asty
-        scope = node._scope
-        defined = set()
-        undefined = list(node.names)  # keep order, so can't use set
-        while undefined and scope.parent:
-            scope = scope.parent
-            has = set()
-            if isinstance(scope, ScopeFn):
-                has = scope.defined
-            elif isinstance(scope, ScopeLet):
-                has = set(scope.bindings.keys())
-            elif isinstance(scope, ScopeGlobal):
-                res = []
-                if not scope.defined.issuperset(undefined):
-                    # emit nonlocal, let python raise the error
-                    break
-                if undefined:
-                    res.append(asty.Global(node, names=list(undefined)))
-                if defined:
-                    res.append(asty.Nonlocal(node, names=list(defined)))
-                return res
-            defined.update(has.intersection(undefined))
-            undefined = [name for name in undefined if name not in has]
-        return [asty.Nonlocal(node, names=node.names)] if node.names else []
+def _resolve_outer_var(node):
+    "Return the `Nonlocal` and `Global` statements that replace `node`."
+    from hy.compiler import asty
+    scope = node._scope
+    defined = set()
+    undefined = list(node.names)  # keep order, so can't use set
+    while undefined and scope.parent:
+        scope = scope.parent
+        has = set()
+        if isinstance(scope, ScopeFn):
+            has = scope.defined
+        elif isinstance(scope, ScopeLet):
+            has = set(scope.bindings.keys())
+        elif isinstance(scope, ScopeGlobal):
+            res = []
+            if not scope.defined.issuperset(undefined):
+                # emit nonlocal, let python raise the error
+                break
+            if undefined:
+                res.append(asty.Global(node, names=list(undefined)))
+            if defined:
+                res.append(asty.Nonlocal(node, names=list(defined)))
+            return res
+        defined.update(has.intersection(undefined))
+        undefined = [name for name in undefined if name not in has]
+    return [asty.Nonlocal(node, names=node.names)] if node.names else []
+
+
+def resolve_outer_vars(outer_vars, stmts):
+    """Replace each of the `OuterVar` nodes `outer_vars` with the
+    statements it resolves to, and return `stmts`, the statements of the
+    whole module. Each node is looked for only in the definition of its
+    nearest enclosing function or class, if it has one, rather than in
+    all of `stmts`."""
+    for node in outer_vars:
+        owner = nearest_python_scope(node._scope)
+        body = None
+        if getattr(owner, "node", None) is not None:
+            body = _containing_list(owner.node.body, node)
+        if body is None:
+            body = _containing_list(stmts, node)
+        if body is None:
+            # The node was compiled, but then not used.
+            continue
+        i = next(i for i, x in enumerate(body) if x is node)
+        body[i : i + 1] = _resolve_outer_var(node)
+    return stmts
+
+
+def _containing_list(stmts, node):
+    """Return the list of statements that holds `node`, searching `stmts`
+    and the statements nested in them."""
+    todo = [stmts]
+    while todo:
+        body = todo.pop()
+        for x in body:
+            if x is node:
+                return body
+            for _, value in ast.iter_fields(x):
+                if (isinstance(value, list) and value
+                        and isinstance(value[0], ast.AST)
+                        and not isinstance(value[0], ast.expr)):
+                    todo.append(value)
+    return None
 
 
 class NodeRef:
@@ -311,6 +348,9 @@ class ScopeFn(ScopeBase):
         self.has_yield = False
         """bool: `True` if this scope is tracking a function that has `yield`
         statements, as generator functions may need special handling"""
+        self.node = None
+        """ast.AST: The function or class definition compiled for this
+        scope, once there is one"""
 
         if args:
             for arg in itertools.chain(
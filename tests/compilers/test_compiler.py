@@ -88,3 +88,75 @@ def test_correct_logic():
     assert py.count("x = 4") == 1
     assert py.count("x or 3") == 1
     assert py.count("and") == 2
+
+
+def test_compile_leaves_models_unchanged():
+    """
+    Check that compiling a tree doesn't mutate its models, since the
+    compiler no longer copies each model before compiling it.
+    """
+    src = """
+        (defn #^ int f [#^ int a [b 1] #* args #** kwargs]
+          (.append (.get a "x") f"{b !r :>{a}}")
+          (dfor  x (range 3)  :if x  x (* 2 x)))
+        (setv #^ int y 1  [z w] [2 3])
+        (lfor x [1 2] #* [x x])
+        (.foo.bar obj :k 1 #** kw)"""
+    tree = list(read_many(src))
+    before = [(x.fingerprint(), repr(x)) for x in tree]
+    py = ast.unparse(hy_compile(tree, "test", import_stdlib=False))
+    assert [(x.fingerprint(), repr(x)) for x in tree] == before
+    assert ast.unparse(hy_compile(tree, "test", import_stdlib=False)) == py
+
+
+def test_result_iadd():
+    """
+    Check that adding to a Result in place gives the same Result as
+    adding out of place, without copying the statements.
+    """
+    a = ast.Pass()
+    b = ast.Name(id="b", ctx=ast.Load())
+    other = compiler.Result(expr=b, temp_variables=[b])
+    ret = compiler.Result(stmts=[a])
+    stmts = ret.stmts
+    ret2 = ret + other
+    ret += other
+    assert ret.stmts is stmts
+    assert ret.stmts == ret2.stmts == [a]
+    assert ret.expr is ret2.expr is b
+    assert ret.temp_variables is ret2.temp_variables is other.temp_variables
+
+    ret += ast.Expr(value=b)
+    ret += b
+    assert len(ret.stmts) == 2 and ret.expr is b and ret.temp_variables == []
+
+
+def test_resolve_outer_vars():
+    """
+    Check that `nonlocal` is resolved whether it becomes one statement,
+    two, or none, and that the compiler forgets the nodes afterwards.
+    """
+    c = compiler.HyASTCompiler(types.ModuleType("test"))
+    src = """
+        (setv g 1)
+        (defn f [] (setv x 1) (fn [] (nonlocal g) (nonlocal x g)))"""
+    py = ast.unparse(hy_compile(read_many(src), "test", compiler=c))
+    assert "global g\n" in py
+    assert "global g\n        nonlocal x\n" in py
+    assert c.outer_vars == []
+    py = hy2py("(setv g 1) (defn f [] (setv x 1) (fn [] (nonlocal g) (nonlocal x)))")
+    assert "global g\n        nonlocal x\n" in py
+    assert "nonlocal" not in hy2py("(nonlocal)")
+
+    # Nodes nested in other statements, or in a class, are found, too.
+    src = """
+        (setv g 1)
+        (defn f [y]
+          (setv x 1)
+          (defclass C [] (nonlocal x))
+          (fn [] (when y (while y (nonlocal g x) (setv x 2) (break)))))"""
+    tree = hy_compile(read_many(src), "test", import_stdlib=False)
+    assert not any(type(n).__name__ == "OuterVar" for n in ast.walk(tree))
+    py = ast.unparse(tree)
+    assert "class C:\n        nonlocal x\n" in py
+    assert "while y:\n                global g\n                nonlocal x\n" in py
@@ -9,7 +9,7 @@ import pytest
 
 import hy
 from hy.compiler import hy_compile
-from hy.errors import HyLanguageError, hy_exc_handler
+from hy.errors import HyLanguageError, HySyntaxError, hy_exc_handler
 from hy.importer import HyLoader
 from hy.reader import read_many
 
@@ -295,3 +295,28 @@ def test_zipimport(tmp_path, monkeypatch):
 def test_eval_requiring_macro():
     # https://github.com/hylang/hy/issues/2695
     hy.eval(hy.read("(require tests.resources.macros)"), globals={})
+
+
+def test_import_large_source(tmp_path, monkeypatch):
+    # Big sources are read without first being decoded into a string.
+    monkeypatch.setattr("hy.importer._STREAMED_SOURCE_SIZE", 0)
+    (tmp_path / "big_hy_source.hy").write_text(
+        '#!/usr/bin/env hy\n(setv x "☃")\n(setv y (+ x "✈"))', encoding="utf-8"
+    )
+    monkeypatch.syspath_prepend(tmp_path)
+    import big_hy_source
+
+    assert big_hy_source.y == "☃✈"
+
+
+def test_import_large_source_error(tmp_path, monkeypatch):
+    # Compiler errors in big sources still quote the source.
+    monkeypatch.setattr("hy.importer._STREAMED_SOURCE_SIZE", 0)
+    (tmp_path / "big_hy_error.hy").write_text(
+        '(setv x "☃")\n\n(setv None 1)', encoding="utf-8"
+    )
+    monkeypatch.syspath_prepend(tmp_path)
+    with pytest.raises(HySyntaxError) as e:
+        import big_hy_error
+    assert (e.value.lineno, e.value.offset) == (3, 7)
+    assert e.value.text == "(setv None 1)"
@@ -2,7 +2,7 @@ import pytest
 
 from hy.compiler import HyASTCompiler
 from hy.errors import HyMacroExpansionError
-from hy.macros import macro, macroexpand
+from hy.macros import lookup_macro, macro, macroexpand
 from hy.models import Expression, Float, List, String, Symbol
 from hy.reader import read
 
@@ -61,3 +61,35 @@ def test_macroexpand_source_data():
     bad = macroexpand(ast, "hy.core.macros", once = True)
     assert bad.start_line == 3
     assert bad.start_column == 5
+
+
+def test_lookup_macro_cache():
+    """Test that cached macro lookups see changes to macro namespaces"""
+    import sys
+
+    module = sys.modules[__name__]
+    compiler = HyASTCompiler(__name__)
+    assert lookup_macro("tmac2", module, compiler) is None
+    module._hy_macros["tmac2"] = tmac
+    assert lookup_macro("tmac2", module, compiler) is tmac
+    del module._hy_macros["tmac2"]
+    assert lookup_macro("tmac2", module, compiler) is None
+
+    # Local macros shadow global ones until their local state ends.
+    test = module._hy_macros["test"]
+    assert lookup_macro("test", module, compiler) is test
+    with compiler.local_state():
+        compiler.local_state_stack[-1]["macros"]["test"] = len
+        assert lookup_macro("test", module, compiler) is len
+    assert lookup_macro("test", module, compiler) is test
+
+    # Ordinary dictionaries work, too, without the cache.
+    saved = module._hy_macros
+    module._hy_macros = dict(saved)
+    try:
+        module._hy_macros["tmac2"] = tmac
+        assert lookup_macro("tmac2", module, compiler) is tmac
+        del module._hy_macros["tmac2"]
+        assert lookup_macro("tmac2", module, compiler) is None
+    finally:
+        module._hy_macros = saved
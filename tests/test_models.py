@@ -40,6 +40,25 @@ def test_symbol_or_keyword():
             Keyword(x)
 
 
+def test_symbol_and_keyword_reuse():
+    # Legal names are remembered, but each construction still makes a
+    # new model, since models can be given positions.
+    a, b = Symbol("foo"), Symbol("foo")
+    assert a == b and a is not b
+    a.start_line = 5
+    assert not hasattr(Symbol("foo"), "_start_line")
+    # Illegal names keep raising.
+    for _ in range(2):
+        with pytest.raises(ValueError, match="can't end with a dot"):
+            Symbol("foo.")
+        with pytest.raises(ValueError, match="illegal keyword"):
+            Keyword("a b")
+    # Keywords with equal names share the name.
+    assert Keyword("foo" + "-bar").name is Keyword("foo-bar").name
+    k = Keyword("x")
+    assert k == k and not (k != k)
+
+
 def test_wrap_int():
     wrapped = as_model(0)
     assert type(wrapped) == Integer
@@ -165,6 +184,42 @@ def test_number_model_copy():
     assert c == copy.deepcopy(c)
 
 
+def test_model_slots_copy_and_pickle():
+    import pickle
+
+    models = [
+        Symbol("a"),
+        String("b", brackets="x"),
+        Keyword("c"),
+        Float(1.5),
+        Complex(2j),
+        Integer(3),
+        List([Symbol("d")]),
+    ]
+    for i, m in enumerate(models):
+        m.start_line, m.start_column, m.end_line, m.end_column = i + 1, 2, i + 3, 4
+        m.extra = i
+    # Positions of the slotted models don't need an instance dictionary.
+    assert "_start_line" not in models[0].__dict__
+
+    copies = [copy.copy, copy.deepcopy] + [
+        lambda x, p=p: pickle.loads(pickle.dumps(x, p))
+        for p in range(pickle.HIGHEST_PROTOCOL + 1)
+    ]
+    for f in copies:
+        for i, m in enumerate(models):
+            c = f(m)
+            assert type(c) is type(m) and c == m
+            assert (c.start_line, c.start_column, c.end_line, c.end_column) == (
+                i + 1,
+                2,
+                i + 3,
+                4,
+            )
+            assert c.extra == i
+        assert f(models[1]).brackets == "x"
+
+
 PRETTY_STRINGS = {
     k
     % ("[1.0] {1.0} (1.0) #{1.0}",): v.format(
@@ -251,6 +306,46 @@ def test_compound_model_repr():
             assert repr(hy.read(k)) == v
 
 
+def test_as_model_keeps_models():
+    tree = hy.read("(a [b 1 {:c #(d)}] 2)")
+    assert as_model(tree) is tree
+    assert as_model(tree) is tree
+    # A tree that isn't all models yet is rebuilt, without changing the
+    # original.
+    mixed = Expression([Symbol("a"), List([Integer(1), [2, "x"]])])
+    new = as_model(mixed)
+    assert new == Expression(
+        [Symbol("a"), List([Integer(1), List([Integer(2), String("x")])])]
+    )
+    assert new is not mixed and type(mixed[1][1]) is list
+    assert as_model(new) is new
+
+
+def test_replace_keeps_positioned_trees():
+    source = hy.read("(a [b 1] c)")
+    fingerprint = source.fingerprint()
+    inner = source[1]
+    assert source.replace(Symbol("x")) is source
+    assert source[1] is inner
+    assert source.fingerprint() == fingerprint
+    # A tree without positions is rebuilt, and left as it was.
+    tree = Expression([Symbol("f"), List([Integer(1), source]), Symbol("g")])
+    tree[2].start_line = 7
+    new = tree.replace(source)
+    assert new == tree and new is not tree and new[1] is not tree[1]
+    assert not hasattr(tree, "_start_line") and not hasattr(tree[1], "_start_line")
+    assert new[1][1] is source
+    # Unset positions are filled in, but set positions are kept.
+    assert new.start_line == new[1].start_line == new[1][0].start_line == 1
+    assert new.end_column == new[1].end_column == source.end_column == 11
+    assert new[2].start_line == 7
+    assert source[1].start_column == 4
+    # Non-models are converted.
+    mixed = Expression([Symbol("f"), [1]])
+    new = mixed.replace(source)
+    assert type(new[1]) is List and new[1][0].start_line == 1
+
+
 def test_recursive_model_detection():
     """Check for self-references:
     https://github.com/hylang/hy/issues/2153
@@ -274,3 +369,72 @@ def test_recursive_model_detection():
         with pytest.raises(HyWrapperError) as exc:
             as_model(structure)
         assert "Self-referential" in str(exc)
+
+
+def test_fingerprint():
+    source = '(defn f [x #* y] "doc" (+ x 1.5 -0.0 1j b"b" :k f"a{x !r :>5}" #[[br]]))'
+    a = hy.read(source)
+    b = hy.read(source.replace(" ", "\n  "))
+    assert a.fingerprint() == b.fingerprint()
+    assert len(a.fingerprint()) == 32
+    # It's computed once, for the submodels, too.
+    assert a[3].fingerprint() is a[3].fingerprint()
+    assert a.fingerprint() != hy.read(source.replace("1.5", "2.5")).fingerprint()
+    # Non-model elements are converted.
+    assert Expression([1, "a"]).fingerprint() == Expression(
+        [Integer(1), String("a")]
+    ).fingerprint()
+
+    # Models that are equal can still differ in ways that matter.
+    for x, y in [
+        (Integer(1), Float(1.0)),
+        (Float(0.0), Float(-0.0)),
+        (Symbol("a"), String("a")),
+        (String("a"), String("a", brackets="")),
+        (List([Symbol("a")]), Tuple([Symbol("a")])),
+        (hy.read('f"{x!r}"'), hy.read('f"{x!s}"')),
+        (Expression([Expression()]), Expression([List()])),
+    ]:
+        assert x.fingerprint() != y.fingerprint()
+
+    # Deeply nested trees are fine.
+    deep = Expression()
+    for _ in range(10_000):
+        deep = Expression([Symbol("f"), deep])
+    assert deep.fingerprint()
+
+    with pytest.raises(TypeError):
+        hy.models.Lazy(iter([])).fingerprint()
+
+
+def test_fingerprint_fcomponent_replace():
+    # `FComponent.replace` changes a component in place, so the
+    # fingerprints of the models around it mustn't be stale afterwards.
+    tree = hy.read('(print f"{x !r}")')
+    component = tree[1][0]
+    before = tree.fingerprint()
+    assert tree[0].fingerprint() is tree[0].fingerprint()
+    component.replace(hy.read('f"{x !s}"')[0])
+    assert component.conversion == "s"
+    assert tree.fingerprint() != before
+    assert tree.fingerprint() == hy.read('(print f"{x !s}")').fingerprint()
+
+
+def test_fingerprint_stable():
+    # The fingerprint doesn't depend on hash randomization.
+    import os
+    import subprocess
+    import sys
+
+    source = '(f :k "s" [1 2.5])'
+    code = f"import hy; print(hy.read({source!r}).fingerprint())"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert outputs == {hy.read(source).fingerprint()}
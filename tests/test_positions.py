@@ -25,3 +25,38 @@ def test_defmacro_raise():
     x = cpl("(defmacro m [] '(do (raise)))\n(m)")
     assert isinstance(x, ast.Raise)
     assert x.lineno == 3
+
+
+def test_asty():
+    from hy.compiler import asty
+    from hy.models import Symbol
+
+    x = list(read_many("\n  foo"))[0]
+    node = asty.Name(x, id="foo", ctx=ast.Load())
+    assert (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset) == (
+        2, 3, 2, 5)
+    # Other AST nodes can provide the position, too.
+    node = asty.Expr(node, value=node)
+    assert (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset) == (
+        2, 3, 2, 5)
+    # A model with no position gets the default.
+    node = asty.Name(Symbol("foo"), id="foo", ctx=ast.Load())
+    assert (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset) == (
+        1, 1, 1, 1)
+    # `asty.parse` stamps every node that has a position.
+    tree = asty.parse(x, "f(a, [b for b in c])")
+    nodes = [n for n in ast.walk(tree) if n._attributes]
+    assert len(nodes) == 8
+    assert all(n.lineno == 2 and n.end_col_offset == 5 for n in nodes)
+
+
+def test_shared_macro_expansion():
+    # A macro that returns the same form each time shouldn't leave the
+    # position of its first use on it.
+    body = hy_compile(read_many('''
+        (eval-and-compile
+          (setv TEMPLATE '(do (f 1) (g 2))))
+        (defmacro m [] TEMPLATE)
+        (m)
+        (m)'''), __name__).body
+    assert [x.lineno for x in body[-4:]] == [5, 5, 6, 6]
@@ -1,9 +1,11 @@
+import io
 import sys
 import traceback
 from math import isnan
 
 import pytest
 
+import hy
 from hy import PrematureEndOfInput
 from hy.errors import hy_exc_handler
 from hy.models import (
@@ -702,3 +704,355 @@ def test_reader_class_reprs():
     "Don't show internal modules in which these classes are defined."
     assert repr(hy.Reader) == "<class 'hy.Reader'>"
     assert repr(hy.HyReader) == "<class 'hy.HyReader'>"
+
+
+def test_read_leaves_stream_after_form():
+    stream = io.StringIO("(foo\n  bar)  baz\n")
+    assert hy.read(stream) == Expression([Symbol("foo"), Symbol("bar")])
+    assert stream.read() == "  baz\n"
+
+
+def test_reader_pos():
+    reader = hy.HyReader()
+    reader._set_source(io.StringIO("ab\ncd\n\nef"))
+    assert reader.pos == (1, 0)
+    reader.getn(2)
+    assert reader.pos == (1, 2)
+    reader.getc()
+    assert reader.pos == (2, 0)
+    reader.getn(4)
+    assert reader.pos == (4, 0)
+    assert reader.read_ident() == "ef"
+    assert reader.pos == (4, 2)
+
+
+def test_read_ident_end_identifier():
+    reader = hy.HyReader()
+    reader._set_source(io.StringIO("foo|bar baz"))
+    with reader.end_identifier("|"):
+        assert reader.read_ident() == "foo"
+    assert reader.getc() == "|"
+    assert reader.read_ident() == "bar"
+
+
+def test_comments_between_forms():
+    assert tokenize("a ; one\n  ;two\n;; three\nb ;four") == [Symbol("a"), Symbol("b")]
+    with peoi() as e:
+        tokenize("(a ; unclosed")
+    assert e.value.lineno == 1 and e.value.offset == 13
+
+
+def test_fill_pos_in_place():
+    reader = hy.HyReader()
+    reader._set_source(io.StringIO("abc"))
+    reader.getn(3)
+    inner = Expression([Symbol("b")])
+    inner.start_line, inner.start_column = 5, 5
+    m = Expression([Symbol("a"), inner, List([Symbol("c")])])
+    assert reader.fill_pos(m, (1, 1)) is m
+    assert m[1] is inner
+    assert (m[0].start_line, m[0].end_column) == (1, 3)
+    assert (m[2][0].start_line, m[2][0].end_column) == (1, 3)
+    assert inner.start_line == 5 and not hasattr(inner[0], "_start_line")
+
+
+def test_deep_nesting_positions():
+    depth = 150
+    (m,) = tokenize("(" * depth + "x" + ")" * depth)
+    for i in range(depth):
+        assert (m.start_column, m.end_column) == (i + 1, 2 * depth + 1 - i)
+        (m,) = m
+    assert m == Symbol("x") and m.start_column == m.end_column == depth + 1
+
+
+def test_number_classification():
+    "Numeric literals are told apart from symbols without trial construction."
+    for s, expected in [
+        ("1_0", Integer(10)),
+        ("0x_ff", Integer(255)),
+        ("+_1", Integer(1)),
+        ("0_7", Float(7.0)),
+        ("1_.5", Float(1.5)),
+        ("-Infinity", Float("-Inf")),
+        ("-j", Complex(-1j)),
+        ("1+j", Complex(1 + 1j)),
+        ("Infj", Complex("Infj")),
+        ("j", Symbol("j")),
+        ("inf", Symbol("inf")),
+        ("infj", Symbol("infj")),
+        ("_1", Symbol("_1")),
+        ("1e", Symbol("1e")),
+        ("1j+2", Symbol("1j+2")),
+        ("1²", Symbol("1²")),
+        ("١٢", Integer(12)),
+    ]:
+        (m,) = tokenize(s)
+        assert type(m) is type(expected) and m == expected, s
+
+
+class _Pipe(io.TextIOBase):
+    "A non-seekable text stream."
+
+    def __init__(self, text):
+        self._text = io.StringIO(text)
+
+    def read(self, n=-1):
+        return self._text.read(n)
+
+
+def _all_positions(models):
+    def walk(m):
+        yield (type(m), m, m.start_line, m.start_column, m.end_line, m.end_column)
+        if isinstance(m, hy.models.Sequence):
+            for x in m:
+                yield from walk(x)
+
+    return [p for m in models for p in walk(m)]
+
+
+def test_streaming():
+    class TinyChunks(hy.HyReader):
+        CHUNK_SIZE = 7
+
+    source = (
+        '(defn f [x]\n  ; comment\n  (+ x 1.5 "a\\nstring"))\n'
+        + "\n".join(f"[{i} :kw #{{a b}} ...] ; c" for i in range(200))
+        + '\n#[[bracket\nstring]] f"{x !r :>{w}}"'
+    )
+    reader = TinyChunks()
+    it = read_many(_Pipe(source), reader=reader, streaming=True)
+    assert it.source is None
+    streamed = []
+    for m in it:
+        streamed.append(m)
+        # Only a small window of the source is kept.
+        assert len(reader._source) < 4 * max(TinyChunks.CHUNK_SIZE, 60)
+    expected = list(read_many(source))
+    assert streamed == expected
+    assert _all_positions(streamed) == _all_positions(expected)
+
+
+def test_streaming_errors():
+    class TinyChunks(hy.HyReader):
+        CHUNK_SIZE = 3
+
+    source = "".join(f"(a {i})\n" for i in range(50)) + "(foo\n   bar 1.x)"
+    with lexe() as e:
+        list(read_many(_Pipe(source), reader=TinyChunks(), streaming=True))
+    assert (e.value.lineno, e.value.offset, e.value.text) == (52, 10, "   bar 1.x)")
+    with peoi() as e:
+        list(read_many(_Pipe("(a)\n" * 20 + "(b"), reader=TinyChunks(), streaming=True))
+    assert (e.value.lineno, e.value.offset, e.value.text) == (21, 2, "(b")
+
+
+def test_saving_chars():
+    reader = hy.HyReader()
+    reader._set_source(io.StringIO("abc def"))
+    with reader.saving_chars() as saved:
+        reader.getn(2)
+        # The list is filled as characters are consumed.
+        assert saved == ["a", "b"]
+        # Only the new characters are added to the list.
+        chars = saved._list()
+        reader.getc()
+        assert saved[2] == "c" and saved._list() is chars
+        assert "".join(saved) == "abc"
+    reader.getn(2)
+    assert saved == ["a", "b", "c"]
+
+    # Text that's still being saved isn't dropped when streaming.
+    class TinyChunks(hy.HyReader):
+        CHUNK_SIZE = 3
+
+    reader = TinyChunks()
+    reader._set_source(_Pipe("(a) " * 20), streaming=True)
+    with reader.saving_chars() as saved:
+        for _ in range(20):
+            reader.parse_one_form()
+            reader._discard_consumed()
+    assert "".join(saved) == "(a)" + " (a)" * 19
+
+
+def test_parse_cache(tmp_path):
+    from hy.reader import ParseCache
+
+    source = '(defn f [x] (+ x 1.5 "s" f"{x !r}" #{:k}))\n[a b]'
+    cache = ParseCache(maxsize=2, directory=tmp_path)
+    first = list(read_many(source, cache=cache))
+    assert len(list(tmp_path.iterdir())) == 1
+
+    reader = hy.HyReader()
+    it = read_many(source, reader=reader, cache=cache)
+    second = list(it)
+    assert second == first
+    assert _all_positions(second) == _all_positions(first)
+    assert second[0] is not first[0]
+    assert second[0].reader is reader and second[0][3].reader is reader
+    assert it.source == source
+
+    # A new process (simulated with a new cache object) can use the
+    # on-disk copy.
+    assert list(read_many(source, cache=ParseCache(directory=tmp_path))) == first
+
+    # The files hold model dumps, and anything else in their place is
+    # ignored.
+    (path,) = tmp_path.iterdir()
+    assert path.read_bytes().startswith(b"HYMODEL")
+    path.write_bytes(b"\x80\x04garbage")
+    assert list(read_many(source, cache=ParseCache(directory=tmp_path))) == first
+
+    # Plain Python objects are cached, too.
+    source = '[1 "a" {:b #(None 2.5)} #{b"x"}]'
+    for _ in range(2):
+        assert list(read_many(source, python_objects=True, cache=cache)) == [
+            [1, "a", {hy.models.Keyword("b"): (None, 2.5)}, {b"x"}]]
+
+    # The key depends on the source text and filename.
+    assert cache.key(source, "a.hy", reader) != cache.key(source, "b.hy", reader)
+    assert cache.key(source, "a.hy", reader) != cache.key(source + " ", "a.hy", reader)
+    # and the reader macros.
+    reader2 = hy.HyReader()
+    reader2.reader_macros["foo"] = lambda self, key: None
+    assert cache.key(source, "a.hy", reader) != cache.key(source, "a.hy", reader2)
+
+
+def test_parse_cache_stateful_reader(tmp_path):
+    from hy.reader import ParseCache
+
+    cache = ParseCache(directory=tmp_path)
+    reader = hy.HyReader()
+    for model in read_many("(setv x 1) #upper! x", reader=reader, cache=cache):
+        reader.reader_macros["upper!"] = lambda self, key: Symbol(
+            self.parse_one_form().upper()
+        )
+    assert not list(tmp_path.iterdir())
+    # Partially read sources aren't cached, either.
+    next(iter(read_many("1 2", cache=cache)))
+    assert not list(tmp_path.iterdir())
+
+
+def test_split_forms():
+    from hy.reader.parallel import split_forms
+
+    source = "(a\n b)\n'\nc #_\n d\n#^ int\n x\n#[[\n]] \"\n\" ; (\n[e]"
+    splits = split_forms(source)
+    assert [source[i:].split()[0] for i in splits] == [
+        "(a",
+        "'",
+        "#^",
+        '#[[',
+        "[e]",
+    ]
+    for bad in ("(a", "a)", "#foo x", "(defreader foo)", "(require m :readers [r])"):
+        assert split_forms(bad) is None, bad
+
+
+def test_parallel():
+    source = (
+        "#!/usr/bin/env hy\n"
+        + "\n".join(
+            f'(defn f{i} [x]\n  ; comment\n  (+ x {i}.5 "a\nb"))\n'
+            f"'[{i} :kw #{{a b}} #_ 1]"
+            for i in range(100)
+        )
+    )
+    expected = list(read_many(source, skip_shebang=True))
+    reader = hy.HyReader()
+    models = read_many(source, skip_shebang=True, reader=reader, parallel=2)
+    assert models.source == source
+    models = list(models)
+    assert _all_positions(models) == _all_positions(expected)
+    assert all(m.reader is reader for m in models)
+    assert models[1][1][2][0].reader is reader
+
+    # A source that can't be split is read normally, including its
+    # errors.
+    with pytest.raises(PrematureEndOfInput):
+        list(read_many(source + "\n(", skip_shebang=True, parallel=2))
+    # So is a source with errors that the splitter doesn't notice.
+    with pytest.raises(LexException) as e:
+        list(read_many(source + '\n"\\q"', skip_shebang=True, parallel=2))
+    assert e.value.lineno == source.count("\n") + 2
+
+    # Data read as Python objects comes out the same.
+    data = "\n".join(f'[{i} "a" {{:k #{{1.5}}}} #(None)]' for i in range(200))
+    expected = list(read_many(data, python_objects=True))
+    assert list(read_many(data, python_objects=True, parallel=2)) == expected
+    assert type(expected[0]) is list
+
+    # A reader with a changed table or identifier characters is used
+    # to read normally.
+    reader = hy.HyReader()
+    reader.ends_ident.add("|")
+    models = list(read_many("a|b\n" * 100, reader=reader, parallel=2))
+    assert models[:2] == [Symbol("a"), Symbol("|b")]
+    reader = hy.HyReader()
+    reader.reader_table["'"] = lambda self, _: Keyword("quote")
+    models = list(read_many("'a\n" * 100, reader=reader, parallel=2))
+    assert models[:2] == [Keyword("quote"), Symbol("a")]
+
+
+def test_reparse():
+    reader = hy.HyReader()
+    source = "#!/usr/bin/env hy\n(a 1)\n[b c] ; comment\n(d\n  e) f\n'g"
+    previous = reader.parse_all(source, "f.hy", skip_shebang=True)
+    assert list(previous) == list(read_many(source, skip_shebang=True))
+    assert previous.spans[0] == (18, 23)
+
+    def check(result, offset, deleted, inserted):
+        nonlocal source
+        source = source[:offset] + inserted + source[offset + deleted :]
+        expected = hy.HyReader().parse_all(source, "f.hy", skip_shebang=True)
+        result = reader.reparse(result, offset, deleted, inserted)
+        assert result.source == source
+        assert result.spans == expected.spans
+        assert _all_positions(result) == _all_positions(expected)
+        return result
+
+    a, b, d, f, g = previous.models
+    # Editing one form rereads only that form.
+    result = check(previous, source.index("c"), 1, "cc")
+    assert result.models[0] is a and result.models[2] is d
+    # Later forms are shifted, on the same line and on later lines.
+    result = check(result, source.index("1"), 0, "\n  2")
+    assert result.models[2:] == [d, f, g] and result.models[3] is f
+    # An edit can split forms, join them, or comment them out.
+    result = check(result, source.index(" f") + 2, 0, "oo h")
+    result = check(result, source.index("\n'g"), 2, "")
+    assert result.models[-1] == Symbol("hg")
+    result = check(result, source.index("[b"), 0, ";")
+    result = check(result, source.index("(a"), 0, "x ")
+    result = check(result, len(source), 0, " y")
+    assert result.models[0] == Symbol("x") and result.models[-1] == Symbol("y")
+
+    # Errors are raised, leaving the previous result unchanged.
+    with pytest.raises(PrematureEndOfInput):
+        reader.reparse(result, len(source), 0, "(")
+    assert result.models[-1].start_line == source.count("\n") + 1
+    with pytest.raises(ValueError):
+        reader.reparse(result, len(source), 1, "")
+
+
+def test_read_utf8_buffer(tmp_path):
+    import mmap
+
+    class TinyChunks(hy.HyReader):
+        CHUNK_SIZE = 3
+
+    source = "#!/usr/bin/env hy\n(setv ☘ \"ÿé ☃ 𝔘\")\n" + "[λ 𝔘 :ü]\n" * 50 + "\"✈\""
+    expected = list(read_many(source, skip_shebang=True))
+    p = tmp_path / "f.hy"
+    p.write_text(source, encoding="utf-8")
+    with open(p, "rb") as o, mmap.mmap(o.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        for buffer in (source.encode("utf-8"), m):
+            models = read_many(buffer, skip_shebang=True, reader=TinyChunks())
+            assert models.source is None
+            models = list(models)
+            assert _all_positions(models) == _all_positions(expected)
+
+    errors = []
+    for x in ("(a\n  (b ☃ c)", "(a\n  (b ☃ c)".encode("utf-8")):
+        with pytest.raises(PrematureEndOfInput) as e:
+            list(read_many(x))
+        errors.append((e.value.lineno, e.value.offset, e.value.text))
+    assert errors[0] == errors[1]